@@ -98,7 +98,7 @@ KEYWORDS = [
 # Entry points for command-line tools
 ENTRY_POINTS = {
     'console_scripts': [
-        'ultrasonic-agentics=agentic_commands_stego.mcp_tools.cli:main',
+        'ultrasonic-agentics=agentic_commands_stego.mcp_tools.cli:cli_entry',
         'ultrasonic-server=agentic_commands_stego.mcp_tools.server:run_server',
         'ultrasonic-api=agentic_commands_stego.server.api:main',
     ],
@@ -239,6 +239,18 @@ class AudioDecoder:
         # Extract payload using ultrasonic decoder
         payload = self.decoder.decode_payload(audio_data)
         
+        return self._payload_to_command(payload)
+    
+    def _payload_to_command(self, payload: Optional[bytes]) -> Optional[str]:
+        """
+        Recover command from an extracted payload.
+        
+        Args:
+            payload: Payload bytes from the ultrasonic decoder (or None)
+            
+        Returns:
+            Decoded command string, or None if decoding fails
+        """
         if payload is None:
             return None
         
@@ -370,14 +382,13 @@ class AudioDecoder:
                 if max_val > 0:
                     audio_data = audio_data / max_val
             
-            # Analyze signal
-            has_signal = self.decoder.detect_signal_presence(audio_data)
-            signal_strength = self.decoder.get_signal_strength(audio_data)
+            # Analyze signal (filters once, decodes only if a signal is present)
+            analysis = self.decoder.analyze_signal(audio_data)
+            has_signal = analysis['has_signal']
+            signal_strength = analysis['signal_strength']
             
             # Try to decode
-            decoded_command = None
-            if has_signal:
-                decoded_command = self._decode_audio_data(audio_data)
+            decoded_command = self._payload_to_command(analysis['payload'])
             
             return {
                 'file_path': file_path,
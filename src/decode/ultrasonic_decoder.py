@@ -3,15 +3,70 @@ Ultrasonic decoder for extracting data from near-ultrasonic frequency ranges.
 Decodes FSK (Frequency Shift Keying) modulated signals.
 """
 
+import binascii
+import math
+from functools import lru_cache
 import numpy as np
 from typing import Optional, Tuple, List
 from scipy import signal
 from scipy.signal import find_peaks
 
 
+# Majority of three repeated bits, indexed by the triplet read as a 3-bit number
+_MAJORITY_OF_3 = np.array([0, 0, 0, 1, 0, 1, 1, 1], dtype=np.uint8)
+_TRIPLET_WEIGHTS = np.array([4, 2, 1], dtype=np.uint8)
+
+
+@lru_cache(maxsize=None)
+def _load_preamble_kernel():
+    """
+    Compile the preamble search kernel with Numba on first use.
+    
+    Numba is an optional dependency and is imported lazily so that importing
+    the decoder stays cheap.
+    
+    Returns:
+        Compiled kernel, or None if Numba is not available
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    
+    @njit(cache=True, fastmath=True, nogil=True)
+    def find_preamble(signal, refs, refs_q, step, num_positions, min_score):
+        # Scores candidate positions exactly like _correlate_with_pattern,
+        # with the per-bit reference tones stacked in pattern order, and
+        # stops at the first one above min_score. The GIL is released so
+        # callers can search several signals from a thread pool.
+        num_bits, samples_per_bit = refs.shape
+        for position in range(num_positions):
+            start = position * step
+            score = 0.0
+            for i in range(num_bits):
+                offset = start + i * samples_per_bit
+                in_phase = 0.0
+                quadrature = 0.0
+                for k in range(samples_per_bit):
+                    in_phase += signal[offset + k] * refs[i, k]
+                    quadrature += signal[offset + k] * refs_q[i, k]
+                score += math.sqrt(in_phase * in_phase + quadrature * quadrature)
+            if score > min_score:
+                return start
+        return -1
+    
+    return find_preamble
+
+
 class UltrasonicDecoder:
     """Decoder for extracting data from ultrasonic frequencies using FSK."""
     
+    # Synchronization preamble emitted by the encoder
+    PREAMBLE_PATTERN = "10101010" + "11110000" + "10101010"
+    
+    # Upper limit on bits extracted after the preamble
+    MAX_EXTRACTED_BITS = 10001
+    
     def __init__(self,
                  freq_0: float = 18500,
                  freq_1: float = 19500,
@@ -39,6 +94,9 @@ class UltrasonicDecoder:
         
         # Design band-pass filter for ultrasonic range
         self._design_filters()
+        
+        # Precompute per-bit reference tones for matched filtering
+        self._design_references()
     
     def _design_filters(self) -> None:
         """Design band-pass filters for signal isolation."""
@@ -52,7 +110,8 @@ class UltrasonicDecoder:
         low_freq = max(low_freq, 100) / nyquist
         high_freq = min(high_freq, nyquist - 100) / nyquist
         
-        self.bp_filter = signal.butter(4, [low_freq, high_freq], btype='band')
+        # Second-order sections are numerically stable at these narrow band edges
+        self.bp_filter = signal.butter(4, [low_freq, high_freq], btype='band', output='sos')
         
         # Individual filters for each frequency
         bandwidth = 500  # Hz
@@ -65,6 +124,22 @@ class UltrasonicDecoder:
         freq_1_high = (self.freq_1 + bandwidth) / nyquist
         self.freq_1_filter = signal.butter(4, [freq_1_low, freq_1_high], btype='band')
     
+    def _design_references(self) -> None:
+        """
+        Precompute one-bit reference tones for both FSK frequencies.
+        
+        The encoder is phase-continuous, so a bit can start at any carrier
+        phase; each reference therefore has an in-phase (sine) and a
+        quadrature (cosine) component for non-coherent detection.
+        """
+        # Time axis of one bit period, kept for references at other frequencies
+        self._bit_t = np.linspace(0, self.bit_duration, self.samples_per_bit, endpoint=False)
+        
+        phase_0 = 2 * np.pi * self.freq_0 * self._bit_t
+        phase_1 = 2 * np.pi * self.freq_1 * self._bit_t
+        self._ref_0, self._ref_0_q = np.sin(phase_0), np.cos(phase_0)
+        self._ref_1, self._ref_1_q = np.sin(phase_1), np.cos(phase_1)
+    
     def decode_payload(self, audio_signal: np.ndarray) -> Optional[bytes]:
         """
         Decode payload from audio signal.
@@ -78,6 +153,18 @@ class UltrasonicDecoder:
         # Apply band-pass filter to isolate ultrasonic range
         filtered_signal = self._apply_bandpass_filter(audio_signal)
         
+        return self._decode_filtered_payload(filtered_signal)
+    
+    def _decode_filtered_payload(self, filtered_signal: np.ndarray) -> Optional[bytes]:
+        """
+        Decode payload from an already band-pass filtered signal.
+        
+        Args:
+            filtered_signal: Band-pass filtered audio signal
+            
+        Returns:
+            Decoded payload bytes, or None if decoding fails
+        """
         # Detect preamble and find start position
         start_position = self._detect_preamble(filtered_signal)
         if start_position is None:
@@ -101,7 +188,7 @@ class UltrasonicDecoder:
     def _apply_bandpass_filter(self, audio_signal: np.ndarray) -> np.ndarray:
         """Apply band-pass filter to isolate ultrasonic frequencies."""
         try:
-            filtered = signal.filtfilt(self.bp_filter[0], self.bp_filter[1], audio_signal)
+            filtered = signal.sosfiltfilt(self.bp_filter, audio_signal)
             return filtered
         except Exception:
             # Fallback to unfiltered signal if filtering fails
@@ -118,7 +205,7 @@ class UltrasonicDecoder:
             Start position after preamble, or None if not found
         """
         # Expected preamble pattern
-        preamble_pattern = "10101010" + "11110000" + "10101010"
+        preamble_pattern = self.PREAMBLE_PATTERN
         
         # Convert pattern to frequency sequence
         freq_sequence = []
@@ -141,6 +228,19 @@ class UltrasonicDecoder:
         step_size = max(1, self.samples_per_bit // 8)  # Smaller steps for more precise detection
         # Fix: Include the case where signal length equals pattern length
         max_start_pos = max(1, len(signal) - pattern_length + 1)
+        
+        kernel = _load_preamble_kernel()
+        if kernel is not None:
+            # Compiled search over the same positions, references and threshold
+            bit_values = np.frombuffer(preamble_pattern.encode('ascii'), dtype=np.uint8) == ord('1')
+            refs = np.where(bit_values[:, np.newaxis], self._ref_1, self._ref_0)
+            refs_q = np.where(bit_values[:, np.newaxis], self._ref_1_q, self._ref_0_q)
+            num_positions = (max_start_pos + step_size - 1) // step_size
+            max_possible = len(freq_sequence) * self.samples_per_bit * 0.5
+            start_pos = kernel(np.ascontiguousarray(signal, dtype=np.float64), refs, refs_q,
+                               step_size, num_positions, self.detection_threshold * max_possible)
+            return None if start_pos < 0 else start_pos + pattern_length
+        
         for start_pos in range(0, max_start_pos, step_size):
             segment = signal[start_pos:start_pos + pattern_length]
             correlation = self._correlate_with_pattern(segment, freq_sequence)
@@ -157,19 +257,25 @@ class UltrasonicDecoder:
             return 0.0
         
         correlation_sum = 0.0
-        t = np.linspace(0, self.bit_duration, self.samples_per_bit, endpoint=False)
         
         for i, expected_freq in enumerate(freq_sequence):
             start_idx = i * self.samples_per_bit
             end_idx = start_idx + self.samples_per_bit
             bit_segment = segment[start_idx:end_idx]
             
-            # Generate reference signal for this frequency
-            ref_signal = np.sin(2 * np.pi * expected_freq * t)
+            # Use the cached reference tones when the frequency is one of ours
+            if expected_freq == self.freq_0:
+                ref_signal, ref_signal_q = self._ref_0, self._ref_0_q
+            elif expected_freq == self.freq_1:
+                ref_signal, ref_signal_q = self._ref_1, self._ref_1_q
+            else:
+                phase = 2 * np.pi * expected_freq * self._bit_t
+                ref_signal, ref_signal_q = np.sin(phase), np.cos(phase)
             
-            # Calculate normalized cross-correlation
+            # Calculate phase-independent cross-correlation magnitude
             if len(bit_segment) == len(ref_signal):
-                correlation = np.abs(np.dot(bit_segment, ref_signal))
+                correlation = np.hypot(np.dot(bit_segment, ref_signal),
+                                       np.dot(bit_segment, ref_signal_q))
                 correlation_sum += correlation
         
         # Normalize by expected maximum correlation
@@ -349,52 +455,42 @@ class UltrasonicDecoder:
         Returns:
             List of (bit, confidence) tuples, or None if extraction fails
         """
-        bit_data = []
-        position = start_position
+        # Frame the signal into whole bit windows
+        num_bits = min((len(signal) - start_position) // self.samples_per_bit,
+                       self.MAX_EXTRACTED_BITS)
+        if num_bits <= 0:
+            return None
         
-        # Track consecutive low power bits for end detection
-        consecutive_low_power = 0
-        max_consecutive_low_power = 5  # Stop after 5 consecutive low power bits
-        
-        while position + self.samples_per_bit <= len(signal):
-            segment = signal[position:position + self.samples_per_bit]
-            
-            # Calculate correlation with both frequencies using time-domain method
-            t = np.linspace(0, self.bit_duration, len(segment), endpoint=False)
-            ref_0 = np.sin(2 * np.pi * self.freq_0 * t)
-            ref_1 = np.sin(2 * np.pi * self.freq_1 * t)
-            
-            power_0 = np.abs(np.dot(segment, ref_0))
-            power_1 = np.abs(np.dot(segment, ref_1))
-            
-            # Calculate total power and confidence
-            total_power = power_0 + power_1
-            power_diff = abs(power_0 - power_1)
-            
-            # Calculate confidence based on power difference and total power
-            if total_power > 0:
-                confidence = min(1.0, power_diff / total_power)  # Normalized confidence
-                confidence *= min(1.0, total_power / self.detection_threshold)  # Scale by signal strength
-            else:
-                confidence = 0.0
-            
-            # Determine bit based on which frequency has more power
-            bit = '0' if power_0 > power_1 else '1'
-            
-            # Track low power segments
-            if total_power < self.detection_threshold * 0.2:
-                consecutive_low_power += 1
-                if consecutive_low_power >= max_consecutive_low_power:
-                    break
-            else:
-                consecutive_low_power = 0
-            
-            bit_data.append((bit, confidence))
-            position += self.samples_per_bit
-            
-            # Early stop if we have extracted enough bits for a reasonable payload
-            if len(bit_data) > 10000:  # Reasonable upper limit
-                break
+        frames = signal[start_position:start_position + num_bits * self.samples_per_bit]
+        frames = frames.reshape(num_bits, self.samples_per_bit)
+        
+        # Correlate every bit window against both cached reference tones at
+        # once, combining in-phase and quadrature parts so the carrier phase
+        # at the start of each bit does not matter
+        power_0 = np.hypot(frames @ self._ref_0, frames @ self._ref_0_q)
+        power_1 = np.hypot(frames @ self._ref_1, frames @ self._ref_1_q)
+        
+        # Calculate total power and confidence
+        total_power = power_0 + power_1
+        power_diff = np.abs(power_0 - power_1)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            confidence = np.minimum(1.0, power_diff / total_power)  # Normalized confidence
+            confidence *= np.minimum(1.0, total_power / self.detection_threshold)  # Scale by signal strength
+        confidence = np.where(total_power > 0, confidence, 0.0)
+        
+        # Stop before the 5th consecutive low power bit (end of transmission)
+        max_consecutive_low_power = 5
+        low_power = (total_power < self.detection_threshold * 0.2).astype(np.int32)
+        if len(low_power) >= max_consecutive_low_power:
+            run_lengths = np.convolve(low_power, np.ones(max_consecutive_low_power, dtype=np.int32), 'valid')
+            run_ends = np.flatnonzero(run_lengths == max_consecutive_low_power)
+            if len(run_ends) > 0:
+                num_bits = run_ends[0] + max_consecutive_low_power - 1
+        
+        # Determine bit based on which frequency has more power
+        bits = np.where(power_0[:num_bits] > power_1[:num_bits], '0', '1')
+        bit_data = list(zip(bits.tolist(), confidence[:num_bits].tolist()))
         
         return bit_data if bit_data else None
     
@@ -411,56 +507,30 @@ class UltrasonicDecoder:
         if len(bit_data) < 48:  # Need at least 16-bit length prefix * 3 repetitions
             return None
         
-        # Convert to bit string
-        bit_string = ''.join(bit for bit, _ in bit_data)
+        # Convert to a 0/1 bit array
+        bits = np.array([bit for bit, _ in bit_data]) == '1'
         
         # Apply majority voting on repeated bits (each bit repeated 3 times)
-        decoded_bits = ""
-        for i in range(0, len(bit_string), 3):
-            if i + 2 < len(bit_string):
-                # Get three copies of the bit
-                bit_votes = bit_string[i:i+3]
-                # Count votes
-                ones = bit_votes.count('1')
-                zeros = bit_votes.count('0')
-                # Majority vote
-                if ones > zeros:
-                    decoded_bits += '1'
-                else:
-                    decoded_bits += '0'
-            else:
-                # Not enough bits for voting, stop
-                break
+        decoded_bits = self._majority_vote(bits)
         
         # Extract 16-bit length prefix
         if len(decoded_bits) < 16:
             return None
-            
+        
         length_bits = decoded_bits[:16]
         payload_bits = decoded_bits[16:]
         
-        try:
-            # Parse expected payload length
-            expected_length = int(length_bits, 2)
-            
-            # Validate length is reasonable
-            if expected_length <= 0 or expected_length > len(payload_bits):
-                return None
-            
-            # Extract the expected number of bits
-            actual_payload_bits = payload_bits[:expected_length]
-            
-            # Convert to bytes
-            byte_data = bytearray()
-            for i in range(0, len(actual_payload_bits), 8):
-                chunk = actual_payload_bits[i:i+8]
-                if len(chunk) == 8:
-                    byte_data.append(int(chunk, 2))
-            
-            return bytes(byte_data) if byte_data else None
-            
-        except ValueError:
+        # Parse expected payload length
+        expected_length = int(np.packbits(length_bits).view('>u2')[0])
+        
+        # Validate length is reasonable
+        if expected_length <= 0 or expected_length > len(payload_bits):
             return None
+        
+        # Pack the complete bytes of the expected payload
+        byte_data = np.packbits(payload_bits[:expected_length // 8 * 8]).tobytes()
+        
+        return byte_data if byte_data else None
     
     def _remove_interleaving(self, bit_string: str) -> str:
         """Remove bit interleaving to restore original bit order."""
@@ -584,19 +654,8 @@ class UltrasonicDecoder:
     
     def _calculate_crc16(self, data: bytes) -> int:
         """Calculate CRC-16 checksum (CRC-16-CCITT)."""
-        crc = 0xFFFF
-        polynomial = 0x1021
-        
-        for byte in data:
-            crc ^= (byte << 8)
-            for _ in range(8):
-                if crc & 0x8000:
-                    crc = (crc << 1) ^ polynomial
-                else:
-                    crc <<= 1
-                crc &= 0xFFFF
-        
-        return crc
+        # CRC-CCITT (polynomial 0x1021, MSB first) with the 0xFFFF initial value
+        return binascii.crc_hqx(data, 0xFFFF)
     
     def _decode_bits_to_bytes(self, bit_string: str) -> Optional[bytes]:
         """
@@ -608,42 +667,34 @@ class UltrasonicDecoder:
         Returns:
             Decoded bytes, or None if error correction fails
         """
+        bits = np.frombuffer(bit_string.encode('ascii'), dtype=np.uint8) == ord('1')
+        
         # For backward compatibility with tests, handle simple bit strings without repetition
-        if len(bit_string) < 24:  # Less than minimum for repetition coding
-            # Simple conversion without error correction
-            byte_data = bytearray()
-            for i in range(0, len(bit_string), 8):
-                chunk = bit_string[i:i+8]
-                if len(chunk) == 8:
-                    byte_data.append(int(chunk, 2))
-            return bytes(byte_data) if byte_data else None
+        if len(bits) >= 24:  # At least the minimum for repetition coding
+            # Apply majority voting on repeated bits (each bit repeated 3 times)
+            bits = self._majority_vote(bits)
         
-        # Apply majority voting on repeated bits (each bit repeated 3 times)
-        decoded_bits = ""
-        for i in range(0, len(bit_string), 3):
-            if i + 2 < len(bit_string):
-                # Get three copies of the bit
-                bit_votes = bit_string[i:i+3]
-                # Count votes
-                ones = bit_votes.count('1')
-                zeros = bit_votes.count('0')
-                # Majority vote
-                if ones > zeros:
-                    decoded_bits += '1'
-                else:
-                    decoded_bits += '0'
-            else:
-                # Not enough bits for voting
-                break
+        # Convert complete bytes
+        byte_data = np.packbits(bits[:len(bits) // 8 * 8]).tobytes()
         
-        # Convert to bytes
-        byte_data = bytearray()
-        for i in range(0, len(decoded_bits), 8):
-            chunk = decoded_bits[i:i+8]
-            if len(chunk) == 8:
-                byte_data.append(int(chunk, 2))
+        return byte_data if byte_data else None
+    
+    def _majority_vote(self, bits: np.ndarray) -> np.ndarray:
+        """
+        Collapse 3x repetition coding by majority vote.
         
-        return bytes(byte_data) if byte_data else None
+        Args:
+            bits: 0/1 bit array, each data bit repeated 3 times; a trailing
+                incomplete group is dropped
+            
+        Returns:
+            Decoded 0/1 bit array (uint8)
+        """
+        num_groups = len(bits) // 3
+        triplets = bits[:num_groups * 3].reshape(num_groups, 3).astype(np.uint8)
+        
+        # Read each triplet as a 3-bit number and look up its majority
+        return _MAJORITY_OF_3[triplets @ _TRIPLET_WEIGHTS]
     
     def detect_signal_presence(self, audio_signal: np.ndarray) -> bool:
         """
@@ -658,6 +709,10 @@ class UltrasonicDecoder:
         # Apply band-pass filter
         filtered = self._apply_bandpass_filter(audio_signal)
         
+        return self._is_signal_present(filtered)
+    
+    def _is_signal_present(self, filtered: np.ndarray) -> bool:
+        """Check average power of a band-pass filtered signal against the threshold."""
         # Calculate average power in ultrasonic range
         power = np.mean(np.abs(filtered))
         
@@ -676,12 +731,50 @@ class UltrasonicDecoder:
         # Apply band-pass filter
         filtered = self._apply_bandpass_filter(audio_signal)
         
+        return self._signal_strength(filtered)
+    
+    def _signal_strength(self, filtered: np.ndarray) -> float:
+        """Get RMS strength of a band-pass filtered signal."""
         # Calculate RMS power
         rms = np.sqrt(np.mean(filtered ** 2))
         
         # Return RMS directly for better sensitivity to amplitude differences
         return rms
     
+    def analyze_signal(self, audio_signal: np.ndarray) -> dict:
+        """
+        Detect, measure and decode an ultrasonic signal in one pass.
+        
+        The band-pass filter is applied once and the filtered signal is shared
+        by detection, strength measurement and payload decoding.
+        
+        Args:
+            audio_signal: Audio signal to analyze
+            
+        Returns:
+            Dictionary with 'has_signal', 'signal_strength' and 'payload'
+            (decoded bytes, or None if no signal was found or decoding fails)
+        """
+        filtered = self._apply_bandpass_filter(audio_signal)
+        has_signal = self._is_signal_present(filtered)
+        
+        return {
+            'has_signal': has_signal,
+            'signal_strength': self._signal_strength(filtered),
+            'payload': self._decode_filtered_payload(filtered) if has_signal else None
+        }
+    
+    def get_max_signal_duration(self) -> float:
+        """
+        Get the longest signal duration the decoder can make use of.
+        
+        Covers the preamble plus the maximum number of extracted bits.
+        
+        Returns:
+            Duration in seconds
+        """
+        return (len(self.PREAMBLE_PATTERN) + self.MAX_EXTRACTED_BITS) * self.bit_duration
+    
     def set_frequencies(self, freq_0: float, freq_1: float) -> None:
         """
         Set new frequencies for FSK demodulation.
@@ -693,6 +786,7 @@ class UltrasonicDecoder:
         self.freq_0 = freq_0
         self.freq_1 = freq_1
         self._design_filters()
+        self._design_references()
     
     def set_detection_threshold(self, threshold: float) -> None:
         """
@@ -5,7 +5,9 @@ Extracts audio and processes it for hidden commands.
 
 import os
 import tempfile
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack, suppress
+from typing import Dict, List, Optional
 try:
     from moviepy import VideoFileClip
     MOVIEPY_AVAILABLE = True
@@ -15,6 +17,10 @@ except ImportError:
 from .audio_decoder import AudioDecoder
 
 
+# Keep extracted audio in RAM-backed tmpfs where available
+_DEFAULT_TEMP_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+
 class VideoDecoder:
     """Service for decoding encrypted commands from video files."""
     
@@ -48,66 +54,71 @@ class VideoDecoder:
             detection_threshold=detection_threshold
         )
     
-    def decode_file(self, video_path: str, temp_dir: str = None) -> Optional[str]:
+    def decode_file(self,
+                    video_path: str,
+                    temp_dir: str = None,
+                    max_duration: Optional[float] = None) -> Optional[str]:
         """
         Decode command from video file.
         
         Args:
             video_path: Path to video file
             temp_dir: Temporary directory for audio extraction
+            max_duration: Only extract this many leading seconds of audio
+                (None for the whole track)
             
         Returns:
             Decoded command string, or None if decoding fails
         """
-        if temp_dir is None:
-            temp_dir = tempfile.gettempdir()
-        
-        # Generate unique temporary file name
-        temp_audio = os.path.join(temp_dir, f"temp_video_audio_{os.getpid()}.wav")
-        
         try:
-            # Load video
-            video = VideoFileClip(video_path)
-            
-            if video.audio is None:
-                video.close()
-                return None
-            
-            # Extract audio to temporary file
-            try:
-                # Try MoviePy 2.x syntax first
-                video.audio.write_audiofile(
-                    temp_audio,
-                    codec='pcm_s16le'  # Uncompressed for quality
-                )
-            except TypeError:
-                # Fall back to older syntax if needed
-                video.audio.write_audiofile(
-                    temp_audio,
-                    codec='pcm_s16le',
-                    verbose=False,
-                    logger=None
-                )
-            
-            # Decode command from audio
-            command = self.audio_decoder.decode_file(temp_audio)
-            
-            # Clean up
-            video.close()
-            
-            return command
+            with ExitStack() as stack:
+                # Load video
+                video = VideoFileClip(video_path)
+                stack.callback(video.close)
+                
+                if video.audio is None:
+                    return None
+                
+                # Extract audio to temporary file
+                temp_audio = self._temp_audio_path(stack, temp_dir)
+                self._write_audio(video.audio, temp_audio, max_duration)
+                
+                # Decode command from audio
+                return self.audio_decoder.decode_file(temp_audio)
             
         except Exception as e:
             print(f"Error decoding video: {e}")
             return None
+    
+    def decode_files(self,
+                     video_paths: List[str],
+                     temp_dir: str = None,
+                     max_workers: Optional[int] = None,
+                     max_duration: Optional[float] = None) -> Dict[str, Optional[str]]:
+        """
+        Decode commands from several video files concurrently.
+        
+        Audio extraction runs in an ffmpeg subprocess per file, so a thread
+        pool is enough to keep several extractions in flight at once.
+        
+        Args:
+            video_paths: Paths to video files
+            temp_dir: Temporary directory for audio extraction
+            max_workers: Maximum number of worker threads (None for CPU count)
+            max_duration: Only extract this many leading seconds of audio
+                (None for the whole track)
             
-        finally:
-            # Clean up temporary file
-            try:
-                if os.path.exists(temp_audio):
-                    os.remove(temp_audio)
-            except OSError:
-                pass
+        Returns:
+            Mapping of video path to decoded command (None if decoding fails)
+        """
+        if max_workers is None:
+            max_workers = os.cpu_count() or 1
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            commands = executor.map(
+                lambda path: self.decode_file(path, temp_dir, max_duration), video_paths
+            )
+            return dict(zip(video_paths, commands))
     
     def decode_video_clip(self, video_clip: VideoFileClip) -> Optional[str]:
         """
@@ -122,35 +133,18 @@ class VideoDecoder:
         if video_clip.audio is None:
             return None
         
-        # Create temporary file for audio
-        with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-            temp_path = temp_file.name
-        
         try:
-            # Extract audio
-            video_clip.audio.write_audiofile(
-                temp_path,
-                codec='pcm_s16le',
-                verbose=False,
-                logger=None
-            )
-            
-            # Decode command
-            command = self.audio_decoder.decode_file(temp_path)
-            
-            return command
+            with ExitStack() as stack:
+                # Extract audio
+                temp_path = self._temp_audio_path(stack)
+                self._write_audio(video_clip.audio, temp_path)
+                
+                # Decode command
+                return self.audio_decoder.decode_file(temp_path)
             
         except Exception as e:
             print(f"Error decoding video clip: {e}")
             return None
-            
-        finally:
-            # Clean up temporary file
-            try:
-                if os.path.exists(temp_path):
-                    os.remove(temp_path)
-            except OSError:
-                pass
     
     def detect_signal(self, video_path: str) -> bool:
         """
@@ -163,26 +157,19 @@ class VideoDecoder:
             True if signal detected
         """
         try:
-            video = VideoFileClip(video_path)
-            
-            if video.audio is None:
-                video.close()
-                return False
-            
-            # Create temporary audio file
-            with tempfile.NamedTemporaryFile(suffix='.wav') as temp_file:
-                video.audio.write_audiofile(
-                    temp_file.name,
-                    codec='pcm_s16le',
-                    verbose=False,
-                    logger=None
-                )
+            with ExitStack() as stack:
+                video = VideoFileClip(video_path)
+                stack.callback(video.close)
+                
+                if video.audio is None:
+                    return False
+                
+                # Create temporary audio file covering only the signal window
+                temp_audio = self._temp_audio_path(stack)
+                self._write_audio(video.audio, temp_audio, self._signal_window())
                 
                 # Check for signal
-                has_signal = self.audio_decoder.detect_signal(temp_file.name)
-            
-            video.close()
-            return has_signal
+                return self.audio_decoder.detect_signal(temp_audio)
             
         except Exception:
             return False
@@ -198,26 +185,19 @@ class VideoDecoder:
             Signal strength (0.0 to 1.0)
         """
         try:
-            video = VideoFileClip(video_path)
-            
-            if video.audio is None:
-                video.close()
-                return 0.0
-            
-            # Create temporary audio file
-            with tempfile.NamedTemporaryFile(suffix='.wav') as temp_file:
-                video.audio.write_audiofile(
-                    temp_file.name,
-                    codec='pcm_s16le',
-                    verbose=False,
-                    logger=None
-                )
+            with ExitStack() as stack:
+                video = VideoFileClip(video_path)
+                stack.callback(video.close)
+                
+                if video.audio is None:
+                    return 0.0
+                
+                # Create temporary audio file covering only the signal window
+                temp_audio = self._temp_audio_path(stack)
+                self._write_audio(video.audio, temp_audio, self._signal_window())
                 
                 # Get signal strength
-                strength = self.audio_decoder.get_signal_strength(temp_file.name)
-            
-            video.close()
-            return strength
+                return self.audio_decoder.get_signal_strength(temp_audio)
             
         except Exception:
             return 0.0
@@ -233,47 +213,40 @@ class VideoDecoder:
             Analysis results dictionary
         """
         try:
-            video = VideoFileClip(video_path)
-            
-            if video.audio is None:
-                video.close()
-                return {
+            with ExitStack() as stack:
+                video = VideoFileClip(video_path)
+                stack.callback(video.close)
+                
+                if video.audio is None:
+                    return {
+                        'file_path': video_path,
+                        'has_audio': False,
+                        'error': 'No audio track found',
+                        'has_ultrasonic_signal': False,
+                        'signal_strength': 0.0,
+                        'decoded_command': None,
+                        'decoding_successful': False
+                    }
+                
+                # Get video info
+                video_info = {
                     'file_path': video_path,
-                    'has_audio': False,
-                    'error': 'No audio track found',
-                    'has_ultrasonic_signal': False,
-                    'signal_strength': 0.0,
-                    'decoded_command': None,
-                    'decoding_successful': False
+                    'has_audio': True,
+                    'video_duration': video.duration,
+                    'video_fps': video.fps,
+                    'video_size': video.size,
+                    'audio_fps': video.audio.fps if video.audio else None
                 }
-            
-            # Get video info
-            video_info = {
-                'file_path': video_path,
-                'has_audio': True,
-                'video_duration': video.duration,
-                'video_fps': video.fps,
-                'video_size': video.size,
-                'audio_fps': video.audio.fps if video.audio else None
-            }
-            
-            # Create temporary audio file for analysis
-            with tempfile.NamedTemporaryFile(suffix='.wav') as temp_file:
-                video.audio.write_audiofile(
-                    temp_file.name,
-                    codec='pcm_s16le',
-                    verbose=False,
-                    logger=None
-                )
+                
+                # Create temporary audio file for analysis
+                temp_audio = self._temp_audio_path(stack)
+                self._write_audio(video.audio, temp_audio)
                 
                 # Analyze audio
-                audio_analysis = self.audio_decoder.analyze_audio(temp_file.name)
-            
-            # Combine results
-            result = {**video_info, **audio_analysis}
-            
-            video.close()
-            return result
+                audio_analysis = self.audio_decoder.analyze_audio(temp_audio)
+                
+                # Combine results
+                return {**video_info, **audio_analysis}
             
         except Exception as e:
             return {
@@ -286,6 +259,74 @@ class VideoDecoder:
                 'decoding_successful': False
             }
     
+    def _temp_audio_path(self, stack: ExitStack, temp_dir: str = None) -> str:
+        """
+        Create a unique temporary WAV path that is removed when the stack closes.
+        
+        Args:
+            stack: Exit stack that owns the file's cleanup
+            temp_dir: Directory for the file (None for tmpfs, if available)
+            
+        Returns:
+            Path to the (empty) temporary file
+        """
+        fd, path = tempfile.mkstemp(
+            prefix='temp_video_audio_', suffix='.wav', dir=temp_dir or _DEFAULT_TEMP_DIR
+        )
+        os.close(fd)
+        
+        def remove_temp_file():
+            with suppress(OSError):
+                os.remove(path)
+        
+        stack.callback(remove_temp_file)
+        return path
+    
+    def _signal_window(self) -> float:
+        """Get how many leading seconds of audio can contain a decodable signal."""
+        # Embedders place the signal at the start; allow one second of slack
+        return self.audio_decoder.decoder.get_max_signal_duration() + 1.0
+    
+    def _write_audio(self, audio_clip, path: str, max_duration: Optional[float] = None) -> None:
+        """
+        Write a clip's audio track to an uncompressed WAV file.
+        
+        The audio is resampled by ffmpeg straight to the decoder's sample
+        rate, so the decoder never has to resample it again.
+        
+        Args:
+            audio_clip: MoviePy audio clip
+            path: Output WAV path
+            max_duration: Only write this many leading seconds (None for all)
+        """
+        if max_duration is not None and max_duration < audio_clip.duration:
+            try:
+                # Try MoviePy 2.x syntax first
+                audio_clip = audio_clip.subclipped(0, max_duration)
+            except AttributeError:
+                # Fall back to older syntax if needed
+                audio_clip = audio_clip.subclip(0, max_duration)
+        
+        sample_rate = self.audio_decoder.decoder.sample_rate
+        
+        try:
+            # Try MoviePy 2.x syntax first
+            audio_clip.write_audiofile(
+                path,
+                fps=sample_rate,
+                codec='pcm_s16le',  # Uncompressed for quality
+                logger=None
+            )
+        except TypeError:
+            # Fall back to older syntax if needed
+            audio_clip.write_audiofile(
+                path,
+                fps=sample_rate,
+                codec='pcm_s16le',
+                verbose=False,
+                logger=None
+            )
+    
     def get_cipher_key(self) -> bytes:
         """Get the decryption key."""
         return self.audio_decoder.get_cipher_key()
@@ -4,12 +4,30 @@ Combines encryption, ultrasonic encoding, and audio merging.
 """
 
 import os
+from math import gcd
 from typing import Optional, Union
+import numpy as np
+from scipy import signal
+from scipy.io import wavfile
 from pydub import AudioSegment
 from ..crypto.cipher import CipherService
 from .ultrasonic_encoder import UltrasonicEncoder
 
 
+# NumPy dtypes for pydub sample widths (bytes per sample)
+_SAMPLE_DTYPES = {1: np.int8, 2: np.int16, 4: np.int32}
+
+# Export formats by file extension
+_FORMAT_MAP = {
+    '.mp3': 'mp3',
+    '.wav': 'wav',
+    '.flac': 'flac',
+    '.ogg': 'ogg',
+    '.m4a': 'mp4',
+    '.aac': 'aac'
+}
+
+
 class AudioEmbedder:
     """Service for embedding encrypted commands into audio files."""
     
@@ -41,6 +59,18 @@ class AudioEmbedder:
             amplitude=amplitude
         )
     
+    def _create_verifier(self):
+        """Create a decoder with the same settings, for verifying embedded output."""
+        from ..decode.audio_decoder import AudioDecoder
+        return AudioDecoder(
+            key=self.cipher.get_key(),
+            ultrasonic_freq=self.encoder.freq_0,
+            freq_separation=self.encoder.freq_1 - self.encoder.freq_0,
+            sample_rate=self.encoder.sample_rate,
+            bit_duration=self.encoder.bit_duration,
+            detection_threshold=0.01
+        )
+    
     def embed(self, 
               audio: AudioSegment, 
               command: str,
@@ -86,7 +116,7 @@ class AudioEmbedder:
         """
         try:
             # Load audio file
-            audio = AudioSegment.from_file(input_path)
+            audio = self._load_audio(input_path)
             
             # Embed command
             result_audio = self.embed(audio, command, obfuscate)
@@ -109,26 +139,19 @@ class AudioEmbedder:
             result_audio.export(output_path, **export_params)
             
             # Verify the file was created and has content
-            if not os.path.exists(output_path):
+            try:
+                output_size = os.stat(output_path).st_size
+            except FileNotFoundError:
                 print(f"Error: Output file was not created at {output_path}")
                 return False
                 
-            if os.path.getsize(output_path) == 0:
+            if output_size == 0:
                 print(f"Error: Output file is empty at {output_path}")
                 return False
             
             # Verify the embedded signal is present
             try:
-                from ..decode.audio_decoder import AudioDecoder
-                # Create a decoder with the same settings
-                verifier = AudioDecoder(
-                    key=self.cipher.get_key(),
-                    ultrasonic_freq=self.encoder.freq_0,
-                    freq_separation=self.encoder.freq_1 - self.encoder.freq_0,
-                    sample_rate=self.encoder.sample_rate,
-                    bit_duration=self.encoder.bit_duration,
-                    detection_threshold=0.01
-                )
+                verifier = self._create_verifier()
                 
                 # Try to decode the embedded command
                 decoded_command = verifier.decode_file(output_path)
@@ -185,64 +208,107 @@ class AudioEmbedder:
         """
         # Ensure both have same sample rate
         if original.frame_rate != ultrasonic.frame_rate:
-            original = original.set_frame_rate(ultrasonic.frame_rate)
+            original = self._resample(original, ultrasonic.frame_rate)
         
         # Ensure both have same channel count
         if original.channels != ultrasonic.channels:
             if original.channels == 2 and ultrasonic.channels == 1:
                 # Convert ultrasonic to stereo
-                ultrasonic = AudioSegment.from_mono_audiosegments(
-                    ultrasonic, ultrasonic
-                )
+                ultrasonic = self._mono_to_stereo(ultrasonic)
             elif original.channels == 1 and ultrasonic.channels == 2:
                 # Convert original to stereo
-                original = AudioSegment.from_mono_audiosegments(
-                    original, original
-                )
+                original = self._mono_to_stereo(original)
+        
+        # Match sample widths the same way pydub would (widest wins)
+        if original.sample_width != ultrasonic.sample_width:
+            sample_width = max(original.sample_width, ultrasonic.sample_width)
+            original = original.set_sample_width(sample_width)
+            ultrasonic = ultrasonic.set_sample_width(sample_width)
         
         # Determine insertion point (start of audio)
         insertion_point = 0
         
+        samples = self._segment_to_array(original)
+        ultrasonic_samples = self._segment_to_array(ultrasonic)
+        
         # Calculate how much of the original audio to use
-        min_duration = max(len(ultrasonic), 5000)  # At least 5 seconds
+        min_frames = max(len(ultrasonic_samples), original.frame_rate * 5)  # At least 5 seconds
+        
+        # Mix in a wider accumulator; short originals are padded with silence
+        accumulator = np.int32 if samples.dtype.itemsize < 4 else np.int64
+        mixed = np.zeros((max(len(samples), min_frames), samples.shape[1]), dtype=accumulator)
+        mixed[:len(samples)] = samples
+        mixed[insertion_point:insertion_point + len(ultrasonic_samples)] += ultrasonic_samples
+        
+        # Saturate like audioop.add instead of wrapping around
+        limits = np.iinfo(samples.dtype)
+        np.clip(mixed, limits.min, limits.max, out=mixed)
+        
+        return self._array_to_segment(mixed.astype(samples.dtype), original.frame_rate)
+    
+    def _load_audio(self, path: str) -> AudioSegment:
+        """
+        Load an audio file as an audio segment.
+        
+        Integer PCM WAV files are read directly with SciPy; everything else
+        goes through pydub (and ffmpeg where needed).
         
-        if len(original) < min_duration:
-            # Original audio is too short, pad it
-            silence_needed = min_duration - len(original)
-            silence = AudioSegment.silent(
-                duration=silence_needed,
-                frame_rate=original.frame_rate
-            )
-            original = original + silence
+        Args:
+            path: Path to audio file
+            
+        Returns:
+            Loaded audio segment
+        """
+        if os.path.splitext(path)[1].lower() == '.wav':
+            try:
+                frame_rate, samples = wavfile.read(path)
+            except ValueError:
+                # Unsupported WAV variant, let pydub handle it
+                samples = None
+            
+            if samples is not None and samples.dtype in (np.int16, np.int32):
+                return self._array_to_segment(samples.reshape(len(samples), -1), frame_rate)
+        
+        return AudioSegment.from_file(path)
+    
+    def _segment_to_array(self, audio: AudioSegment) -> np.ndarray:
+        """Get the samples of an audio segment as a (frames, channels) array."""
+        samples = np.frombuffer(audio.raw_data, dtype=_SAMPLE_DTYPES[audio.sample_width])
+        return samples.reshape(-1, audio.channels)
+    
+    def _array_to_segment(self, samples: np.ndarray, frame_rate: int) -> AudioSegment:
+        """Wrap a (frames, channels) integer array as an audio segment."""
+        return AudioSegment(
+            np.ascontiguousarray(samples).tobytes(),
+            frame_rate=frame_rate,
+            sample_width=samples.dtype.itemsize,
+            channels=samples.shape[1]
+        )
+    
+    def _resample(self, audio: AudioSegment, frame_rate: int) -> AudioSegment:
+        """Resample audio to a new frame rate using polyphase filtering."""
+        samples = self._segment_to_array(audio)
+        if len(samples) == 0:
+            return self._array_to_segment(samples, frame_rate)
         
-        # Overlay ultrasonic signal at the beginning
-        if len(ultrasonic) <= len(original):
-            # Ultrasonic fits within original audio
-            result = original.overlay(ultrasonic, position=insertion_point)
-        else:
-            # Ultrasonic is longer than original, extend original
-            extension_needed = len(ultrasonic) - len(original)
-            silence = AudioSegment.silent(
-                duration=extension_needed,
-                frame_rate=original.frame_rate
-            )
-            extended_original = original + silence
-            result = extended_original.overlay(ultrasonic, position=insertion_point)
+        divisor = gcd(frame_rate, audio.frame_rate)
+        resampled = signal.resample_poly(
+            samples, frame_rate // divisor, audio.frame_rate // divisor, axis=0
+        )
         
-        return result
+        limits = np.iinfo(samples.dtype)
+        resampled = np.clip(np.rint(resampled), limits.min, limits.max).astype(samples.dtype)
+        return self._array_to_segment(resampled, frame_rate)
+    
+    def _mono_to_stereo(self, audio: AudioSegment) -> AudioSegment:
+        """Duplicate a mono segment into both stereo channels."""
+        samples = self._segment_to_array(audio)
+        return self._array_to_segment(np.repeat(samples, 2, axis=1), audio.frame_rate)
     
     def _get_format_from_path(self, path: str) -> str:
         """Get audio format from file path."""
         extension = os.path.splitext(path)[1].lower()
-        format_map = {
-            '.mp3': 'mp3',
-            '.wav': 'wav',
-            '.flac': 'flac',
-            '.ogg': 'ogg',
-            '.m4a': 'mp4',
-            '.aac': 'aac'
-        }
-        return format_map.get(extension, 'mp3')
+        return _FORMAT_MAP.get(extension, 'mp3')
     
     @staticmethod
     def get_format_recommendations() -> dict:
@@ -1,17 +1,116 @@
 """
 Ultrasonic encoder for embedding data in near-ultrasonic frequency ranges.
-Uses FSK (Frequency Shift Keying) modulation in the 18-20 kHz range.
+Uses continuous-phase FSK (Frequency Shift Keying) modulation in the 18-20 kHz range.
 """
 
+import binascii
+import math
+from functools import lru_cache
 import numpy as np
-from typing import Optional, Tuple
+from typing import Tuple, Union
 from pydub import AudioSegment
-import hashlib
+
+
+def _to_bit_array(bits: Union[str, np.ndarray]) -> np.ndarray:
+    """Convert a string of '0'/'1' characters (or a bit sequence) to a uint8 bit array."""
+    if isinstance(bits, str):
+        return np.frombuffer(bits.encode('ascii'), dtype=np.uint8) - ord('0')
+    return np.asarray(bits, dtype=np.uint8)
+
+
+def _build_hamming_table() -> np.ndarray:
+    """Build the (16, 7) table of Hamming (7,4) codewords indexed by data nibble."""
+    nibbles = np.arange(16, dtype=np.uint8)
+    d1, d2, d3, d4 = ((nibbles >> shift) & 1 for shift in (3, 2, 1, 0))
+    
+    # Hamming (7,4) codeword: p1 p2 d1 p3 d2 d3 d4
+    return np.stack([d1 ^ d2 ^ d4, d1 ^ d3 ^ d4, d1, d2 ^ d3 ^ d4, d2, d3, d4], axis=1)
+
+
+# Only 16 possible data nibbles, so every codeword is precomputed
+_HAMMING_7_4_TABLE = _build_hamming_table()
+
+# Weights turning 4 bits (MSB first) into a nibble value
+_NIBBLE_WEIGHTS = np.array([8, 4, 2, 1], dtype=np.uint8)
+
+# Synchronization preamble (alternating pattern for easy detection); read-only
+# so the shared array can be handed out without copying
+_PREAMBLE_BITS = np.array([1, 0, 1, 0, 1, 0, 1, 0,
+                           1, 1, 1, 1, 0, 0, 0, 0,
+                           1, 0, 1, 0, 1, 0, 1, 0], dtype=np.uint8)
+_PREAMBLE_BITS.setflags(write=False)
+
+# Rows per block interleaver column (burst errors up to this long are spread out)
+_INTERLEAVE_DEPTH = 8
+
+
+@lru_cache(maxsize=32)
+def _build_tone_tables(freq_0: float,
+                       freq_1: float,
+                       sample_rate: int,
+                       samples_per_bit: int,
+                       amplitude: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Build the per-bit tone tables for one set of encoder parameters.
+    
+    Tables are cached per parameter set and shared by every encoder using it,
+    so they are read-only.
+    
+    Returns:
+        Tuple of (sine tones, cosine tones, phase advance per bit)
+    """
+    t = np.arange(samples_per_bit) / sample_rate
+    omega = 2 * np.pi * np.array([[freq_0], [freq_1]])
+    
+    tables = (
+        (amplitude * np.sin(omega * t)).astype(np.float32),
+        (amplitude * np.cos(omega * t)).astype(np.float32),
+        omega[:, 0] * samples_per_bit / sample_rate
+    )
+    for table in tables:
+        table.setflags(write=False)
+    
+    return tables
+
+
+@lru_cache(maxsize=None)
+def _load_fsk_kernel():
+    """
+    Compile the fused FSK modulation kernel with Numba on first use.
+    
+    Numba is an optional dependency and is imported lazily so that importing
+    the encoder stays cheap.
+    
+    Returns:
+        Compiled kernel, or None if Numba is not available
+    """
+    try:
+        from numba import njit
+    except ImportError:
+        return None
+    
+    @njit(cache=True, fastmath=True, nogil=True)
+    def modulate_fsk(bits, start_phase, sin_tones, cos_tones, out):
+        # One pass over the output with no temporaries. The GIL is released
+        # so callers can modulate several payloads from a thread pool (a
+        # prange kernel hangs interpreter shutdown under the TBB threading
+        # layer once it has been called from worker threads).
+        for i in range(bits.shape[0]):
+            bit = bits[i]
+            cos_phase = np.float32(math.cos(start_phase[i]))
+            sin_phase = np.float32(math.sin(start_phase[i]))
+            for k in range(out.shape[1]):
+                out[i, k] = sin_tones[bit, k] * cos_phase + cos_tones[bit, k] * sin_phase
+    
+    return modulate_fsk
 
 
 class UltrasonicEncoder:
     """Encoder for embedding data in ultrasonic frequencies using FSK."""
     
+    __slots__ = ('freq_0', 'freq_1', 'sample_rate', 'bit_duration', 'amplitude',
+                 'samples_per_bit', '_bit_tones')
+    
     def __init__(self, 
                  freq_0: float = 18500,
                  freq_1: float = 19500,
@@ -41,6 +140,9 @@ class UltrasonicEncoder:
         nyquist = sample_rate / 2
         if freq_0 >= nyquist or freq_1 >= nyquist:
             raise ValueError(f"Frequencies must be below Nyquist frequency ({nyquist} Hz)")
+        
+        # Per-bit tone tables, built lazily on first modulation
+        self._bit_tones = None
     
     def encode_payload(self, payload: bytes, add_preamble: bool = True) -> np.ndarray:
         """
@@ -51,183 +153,157 @@ class UltrasonicEncoder:
             add_preamble: Whether to add sync preamble
             
         Returns:
-            Audio signal as numpy array
+            Audio signal as float32 numpy array
         """
-        # Convert payload to bit string
-        bit_string = self._payload_to_bits(payload)
+        # Convert payload to bit array
+        bits = self._payload_to_bits(payload)
         
         # Add error correction to payload only
-        bit_string = self._add_error_correction(bit_string)
+        bits = self._add_error_correction(bits)
         
         # Add preamble for synchronization (after error correction)
         if add_preamble:
             preamble = self._generate_preamble()
-            bit_string = preamble + bit_string
+            bits = np.concatenate([preamble, bits])
         
         # Generate FSK signal
-        signal = self._generate_fsk_signal(bit_string)
+        signal = self._generate_fsk_signal(bits)
         
         return signal
     
-    def _payload_to_bits(self, payload: bytes) -> str:
-        """Convert payload bytes to bit string."""
-        bit_string = ""
-        for byte in payload:
-            bit_string += format(byte, '08b')
-        return bit_string
+    def _payload_to_bits(self, payload: bytes) -> np.ndarray:
+        """Convert payload bytes to a uint8 bit array (MSB first)."""
+        return np.unpackbits(np.frombuffer(payload, dtype=np.uint8))
     
-    def _generate_preamble(self) -> str:
+    def _generate_preamble(self) -> np.ndarray:
         """Generate synchronization preamble pattern."""
-        # Alternating pattern for easy detection
-        return "10101010" + "11110000" + "10101010"
+        return _PREAMBLE_BITS
     
-    def _add_error_correction(self, bit_string: str) -> str:
+    def _add_error_correction(self, bits: Union[str, np.ndarray]) -> np.ndarray:
         """Add simple but reliable error correction."""
+        bits = _to_bit_array(bits)
+        
         # Add 16-bit length prefix
-        length_bits = format(len(bit_string), '016b')
+        length_bits = _to_bit_array(format(len(bits), '016b'))
         
         # Add simple repetition coding (3x) for robustness
         # Each bit is repeated 3 times, decoder uses majority voting
-        repeated_bits = ""
-        for bit in (length_bits + bit_string):
-            repeated_bits += bit * 3  # Repeat each bit 3 times
-        
-        return repeated_bits
+        return np.repeat(np.concatenate([length_bits, bits]), 3)
     
-    def _add_crc_checksum(self, bit_string: str) -> str:
+    def _add_crc_checksum(self, bits: Union[str, np.ndarray]) -> np.ndarray:
         """Add CRC-16 checksum for payload integrity validation."""
-        # Convert bit string to bytes for CRC calculation
-        byte_data = bytearray()
-        for i in range(0, len(bit_string), 8):
-            chunk = bit_string[i:i+8]
-            if len(chunk) == 8:
-                byte_data.append(int(chunk, 2))
-            else:
-                # Pad incomplete chunk
-                padded_chunk = chunk.ljust(8, '0')
-                byte_data.append(int(padded_chunk, 2))
-        
-        # Calculate CRC-16
-        crc = self._calculate_crc16(bytes(byte_data))
-        crc_bits = format(crc, '016b')
+        bits = _to_bit_array(bits)
+        
+        # Pack bits to bytes for CRC calculation (incomplete final byte is zero-padded)
+        crc = self._calculate_crc16(np.packbits(bits).tobytes())
+        crc_bits = np.unpackbits(np.array([crc], dtype='>u2').view(np.uint8))
         
         # Prepend length information (16 bits) and CRC
-        length_bits = format(len(bit_string), '016b')
-        return length_bits + crc_bits + bit_string
+        length_bits = _to_bit_array(format(len(bits), '016b'))
+        return np.concatenate([length_bits, crc_bits, bits])
     
     def _calculate_crc16(self, data: bytes) -> int:
         """Calculate CRC-16 checksum (CRC-16-CCITT)."""
-        crc = 0xFFFF
-        polynomial = 0x1021
-        
-        for byte in data:
-            crc ^= (byte << 8)
-            for _ in range(8):
-                if crc & 0x8000:
-                    crc = (crc << 1) ^ polynomial
-                else:
-                    crc <<= 1
-                crc &= 0xFFFF
-        
-        return crc
+        # CRC-CCITT (polynomial 0x1021, MSB first) with the 0xFFFF initial value
+        return binascii.crc_hqx(data, 0xFFFF)
     
-    def _apply_hamming_codes(self, bit_string: str) -> str:
+    def _apply_hamming_codes(self, bits: Union[str, np.ndarray]) -> np.ndarray:
         """Apply Hamming (7,4) codes for forward error correction."""
-        result = ""
+        bits = _to_bit_array(bits)
         
-        # Process in 4-bit chunks (data bits)
-        for i in range(0, len(bit_string), 4):
-            chunk = bit_string[i:i+4]
-            
-            # Pad incomplete chunk
-            if len(chunk) < 4:
-                chunk = chunk.ljust(4, '0')
-            
-            # Apply Hamming (7,4) encoding
-            hamming_block = self._encode_hamming_7_4(chunk)
-            result += hamming_block
+        # Pad incomplete final chunk of 4 data bits
+        bits = np.pad(bits, (0, -len(bits) % 4))
         
-        return result
+        # Look up the codeword for every nibble at once
+        nibbles = bits.reshape(-1, 4) @ _NIBBLE_WEIGHTS
+        return _HAMMING_7_4_TABLE[nibbles].reshape(-1)
     
     def _encode_hamming_7_4(self, data_bits: str) -> str:
         """Encode 4 data bits into 7-bit Hamming code."""
-        # Data bits: d1, d2, d3, d4
-        d1, d2, d3, d4 = [int(b) for b in data_bits]
-        
-        # Calculate parity bits
-        p1 = d1 ^ d2 ^ d4  # Parity for positions 1,2,4
-        p2 = d1 ^ d3 ^ d4  # Parity for positions 1,3,4
-        p3 = d2 ^ d3 ^ d4  # Parity for positions 2,3,4
-        
         # Hamming (7,4) codeword: p1 p2 d1 p3 d2 d3 d4
-        return f"{p1}{p2}{d1}{p3}{d2}{d3}{d4}"
+        codeword = _HAMMING_7_4_TABLE[int(data_bits, 2)]
+        return ''.join(map(str, codeword))
     
-    def _apply_interleaving(self, bit_string: str) -> str:
+    def _apply_interleaving(self, bits: Union[str, np.ndarray]) -> np.ndarray:
         """Apply bit interleaving to spread burst errors."""
-        # Use block interleaving with depth 8
-        interleave_depth = 8
-        
-        # Pad bit string to be divisible by interleave depth
-        padding_needed = (interleave_depth - (len(bit_string) % interleave_depth)) % interleave_depth
-        padded_bits = bit_string + '0' * padding_needed
-        
-        # Create interleaving matrix
-        num_blocks = len(padded_bits) // interleave_depth
-        matrix = []
-        
-        for i in range(num_blocks):
-            block = padded_bits[i * interleave_depth:(i + 1) * interleave_depth]
-            matrix.append(list(block))
-        
-        # Transpose matrix to interleave bits
-        if matrix:
-            interleaved = []
-            for col in range(interleave_depth):
-                for row in range(num_blocks):
-                    if row < len(matrix) and col < len(matrix[row]):
-                        interleaved.append(matrix[row][col])
-            
-            return ''.join(interleaved)
+        bits = _to_bit_array(bits)
+        
+        # Pad bits to be divisible by interleave depth
+        bits = np.pad(bits, (0, -len(bits) % _INTERLEAVE_DEPTH))
         
-        return bit_string
+        # Block interleaving: write row by row, read column by column
+        return bits.reshape(-1, _INTERLEAVE_DEPTH).T.ravel()
     
-    def _generate_fsk_signal(self, bit_string: str) -> np.ndarray:
-        """Generate FSK modulated signal from bit string."""
-        return self._modulate_fsk(bit_string)
+    def _generate_fsk_signal(self, bits: Union[str, np.ndarray]) -> np.ndarray:
+        """Generate FSK modulated signal from bits."""
+        return self._modulate_fsk(bits)
     
-    def _modulate_fsk(self, bit_string: str) -> np.ndarray:
+    def _modulate_fsk(self, bits: Union[str, np.ndarray]) -> np.ndarray:
         """
-        Perform Frequency Shift Keying modulation on a bit string.
+        Perform continuous-phase Frequency Shift Keying modulation on a bit sequence.
+        
+        The carrier phase is carried across bit boundaries, so switching tones
+        never produces a discontinuity and no per-bit windowing is needed.
         
         Args:
-            bit_string: String of '0' and '1' characters to modulate
+            bits: uint8 bit array (or string of '0' and '1' characters) to modulate
             
         Returns:
-            Modulated signal as numpy array
+            Modulated signal as float32 numpy array
         """
-        total_samples = len(bit_string) * self.samples_per_bit
-        signal = np.zeros(total_samples)
+        bits = _to_bit_array(bits)
+        sin_tones, cos_tones, phase_steps = self._get_bit_tones()
+        
+        # Phase at the start of each bit is the phase accumulated by all
+        # previous bits (exclusive cumulative sum), wrapped to [0, 2*pi)
+        steps = phase_steps[bits]
+        start_phase = np.mod(np.cumsum(steps) - steps, 2 * np.pi)
+        
+        kernel = _load_fsk_kernel()
+        if kernel is not None:
+            # Fused Numba kernel writes every sample directly into the output
+            signal = np.empty((len(bits), self.samples_per_bit), dtype=np.float32)
+            kernel(bits, start_phase, sin_tones, cos_tones, signal)
+            return signal.reshape(-1)
+        
+        start_phase = start_phase[:, np.newaxis]
+        
+        # sin(phi + w*t) = sin(w*t)*cos(phi) + cos(w*t)*sin(phi), with the
+        # per-bit tones gathered by bit value: row i is bit period i.
+        # Phases are accumulated in float64, samples are produced in float32.
+        # Both terms are computed in place so only two full-size buffers exist
+        # (mode='clip' lets np.take write straight into out without buffering;
+        # bit values are always 0 or 1)
+        signal = np.empty((len(bits), self.samples_per_bit), dtype=np.float32)
+        scratch = np.empty_like(signal)
+        
+        np.take(sin_tones, bits, axis=0, out=signal, mode='clip')
+        np.multiply(signal, np.cos(start_phase).astype(np.float32), out=signal)
+        np.take(cos_tones, bits, axis=0, out=scratch, mode='clip')
+        np.multiply(scratch, np.sin(start_phase).astype(np.float32), out=scratch)
+        np.add(signal, scratch, out=signal)
+        
+        return signal.reshape(-1)
+    
+    def _get_bit_tones(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get the tone tables for bit '0' and bit '1'.
         
-        t = np.linspace(0, self.bit_duration, self.samples_per_bit, endpoint=False)
+        The tones only depend on the frequencies, amplitude, sample rate and
+        bit duration, so they are generated once and reused for every bit.
         
-        for i, bit in enumerate(bit_string):
-            start_idx = i * self.samples_per_bit
-            end_idx = start_idx + self.samples_per_bit
-            
-            if bit == '0':
-                freq = self.freq_0
-            else:
-                freq = self.freq_1
-            
-            # Generate sinusoidal tone for this bit
-            tone = self.amplitude * np.sin(2 * np.pi * freq * t)
-            
-            # Apply windowing to reduce clicks
-            tone = self._apply_windowing(tone)
-            
-            signal[start_idx:end_idx] = tone
+        Returns:
+            Tuple of (sine tones, cosine tones, phase advance per bit). The
+            float32 tone arrays have shape (2, samples_per_bit) and the float64
+            phase advances shape (2,); row 0 belongs to bit '0' and row 1 to
+            bit '1', so all three can be indexed by bit value
+        """
+        if self._bit_tones is None:
+            self._bit_tones = _build_tone_tables(
+                self.freq_0, self.freq_1, self.sample_rate, self.samples_per_bit, self.amplitude
+            )
         
-        return signal
+        return self._bit_tones
     
     def _apply_windowing(self, tone: np.ndarray) -> np.ndarray:
         """Apply minimal windowing to reduce spectral artifacts."""
@@ -257,9 +333,14 @@ class UltrasonicEncoder:
         """
         # Normalize signal to int16 range
         if signal.dtype != np.int16:
-            # Scale to int16 range
-            signal = signal / np.max(np.abs(signal)) * 0.8  # Leave headroom
-            signal = (signal * 32767).astype(np.int16)
+            # Peak magnitude without materializing np.abs(signal)
+            peak = max(signal.max(), -signal.min())
+            
+            # Scale to int16 range, leaving headroom, in a single fused pass
+            # that truncates straight into the int16 output buffer
+            scale = 0.8 * 32767 / peak
+            signal = np.multiply(signal, scale, out=np.empty(signal.shape, dtype=np.int16),
+                                 casting='unsafe')
         
         # Create AudioSegment
         audio_segment = AudioSegment(
@@ -271,6 +352,15 @@ class UltrasonicEncoder:
         
         return audio_segment
     
+    def warmup(self) -> None:
+        """
+        Build the cached tone tables and compile the optional Numba kernel now.
+        
+        Call this once at startup so the first real encode does not pay for
+        table generation or JIT compilation.
+        """
+        self._modulate_fsk(_PREAMBLE_BITS)
+    
     def estimate_payload_duration(self, payload_size: int) -> float:
         """
         Estimate duration needed for payload.
@@ -282,7 +372,7 @@ class UltrasonicEncoder:
             Duration in seconds
         """
         # Account for preamble, error correction, and bit encoding
-        preamble_bits = len(self._generate_preamble())
+        preamble_bits = len(_PREAMBLE_BITS)
         payload_bits = payload_size * 8
         
         # Add error correction overhead:
@@ -316,6 +406,7 @@ class UltrasonicEncoder:
         
         self.freq_0 = freq_0
         self.freq_1 = freq_1
+        self._bit_tones = None
     
     def set_amplitude(self, amplitude: float) -> None:
         """
@@ -327,4 +418,5 @@ class UltrasonicEncoder:
         if not 0.0 <= amplitude <= 1.0:
             raise ValueError("Amplitude must be between 0.0 and 1.0")
         
-        self.amplitude = amplitude
\ No newline at end of file
+        self.amplitude = amplitude
+        self._bit_tones = None
\ No newline at end of file
@@ -3,9 +3,12 @@ Video embedder for embedding encrypted commands into video files.
 Extracts audio, embeds command, then recombines with video.
 """
 
+import io
 import os
+import subprocess
 import tempfile
-from typing import Optional
+from typing import List, Optional
+from pydub import AudioSegment
 try:
     from moviepy import VideoFileClip, AudioFileClip
     MOVIEPY_AVAILABLE = True
@@ -13,12 +16,19 @@ except ImportError:
     MOVIEPY_AVAILABLE = False
     VideoFileClip = None
     AudioFileClip = None
+try:
+    # Use the same ffmpeg binary MoviePy is configured with
+    from moviepy.config import FFMPEG_BINARY
+except ImportError:
+    FFMPEG_BINARY = 'ffmpeg'
 from .audio_embedder import AudioEmbedder
 
 
 class VideoEmbedder:
     """Service for embedding encrypted commands into video files."""
     
+    __slots__ = ('audio_embedder',)
+    
     def __init__(self,
                  key: bytes = None,
                  ultrasonic_freq: float = 18500,
@@ -68,119 +78,66 @@ class VideoEmbedder:
             obfuscate: Whether to add obfuscation
             audio_bitrate: Audio bitrate for output
             video_bitrate: Video bitrate for output (None for auto)
-            temp_dir: Temporary directory for intermediate files
+            temp_dir: Unused; kept for compatibility (audio is processed
+                in memory and piped through ffmpeg, nothing is written to disk)
             
         Returns:
             bool: True if embedding was successful, False otherwise
         """
-        if temp_dir is None:
-            temp_dir = tempfile.gettempdir()
-        
-        # Generate unique temporary file names
-        temp_audio_input = os.path.join(temp_dir, f"temp_audio_input_{os.getpid()}.wav")
-        temp_audio_output = os.path.join(temp_dir, f"temp_audio_output_{os.getpid()}.wav")
-        
         try:
-            # Load video
-            video = VideoFileClip(input_path)
-            
-            if video.audio is None:
-                raise ValueError("Input video has no audio track")
-            
-            # Extract audio to temporary file
-            try:
-                # Try MoviePy 2.x syntax first
-                video.audio.write_audiofile(
-                    temp_audio_input,
-                    codec='pcm_s16le'  # Uncompressed for quality
-                )
-            except TypeError:
-                # Fall back to older syntax if needed
-                video.audio.write_audiofile(
-                    temp_audio_input,
-                    codec='pcm_s16le',
-                    verbose=False,
-                    logger=None
-                )
+            # Decode the audio track straight into memory at the encoder's
+            # sample rate, without decoding any video frames
+            audio = self._extract_audio(input_path)
             
             # Embed command in audio
-            success = self.audio_embedder.embed_file(
-                input_path=temp_audio_input,
-                output_path=temp_audio_output,
-                command=command,
-                obfuscate=obfuscate,
-                bitrate=audio_bitrate
-            )
+            result_audio = self.audio_embedder.embed(audio, command, obfuscate)
             
-            if not success:
+            # Verify the embedded signal decodes before muxing it
+            decoded_command = self.audio_embedder._create_verifier().decode_audio_segment(result_audio)
+            if decoded_command != command:
                 print(f"Audio embedding failed for video: {input_path}")
-                # Clean up temporary files before returning
-                for temp_file in [temp_audio_input, temp_audio_output]:
-                    try:
-                        if os.path.exists(temp_file):
-                            os.remove(temp_file)
-                    except OSError:
-                        pass
+                print(f"✗ Embedding verification failed. Expected '{command}', got '{decoded_command}'")
                 return False
             
-            # Load modified audio
-            new_audio = AudioFileClip(temp_audio_output)
-            
-            # Replace audio in video
-            try:
-                # Try MoviePy 2.x syntax first
-                final_video = video.with_audio(new_audio)
-            except AttributeError:
-                # Fall back to older syntax if needed
-                final_video = video.set_audio(new_audio)
-            
             # Prepare output parameters
             if preserve_ultrasonic:
                 # Use PCM audio codec to preserve ultrasonic frequencies
-                output_params = {
-                    'codec': 'libx264',
-                    'audio_codec': 'pcm_s16le',  # Uncompressed audio
-                    'temp_audiofile': os.path.join(temp_dir, f"temp_audiofile_{os.getpid()}.wav"),
-                    'remove_temp': True
-                }
+                audio_params = ['-c:a', 'pcm_s16le']  # Uncompressed audio
                 print(f"Note: Using PCM audio codec to preserve ultrasonic frequencies.")
                 print(f"This will result in larger file sizes but better signal preservation.")
             else:
                 # Use standard AAC codec (will lose ultrasonic frequencies)
-                output_params = {
-                    'codec': 'libx264',
-                    'audio_codec': 'aac',
-                    'audio_bitrate': audio_bitrate,
-                    'temp_audiofile': os.path.join(temp_dir, f"temp_audiofile_{os.getpid()}.m4a"),
-                    'remove_temp': True
-                }
+                audio_params = ['-c:a', 'aac', '-b:a', audio_bitrate]
                 print(f"Warning: Using AAC audio codec which may not preserve ultrasonic frequencies.")
                 print(f"Set preserve_ultrasonic=True for better signal preservation.")
             
             if video_bitrate:
-                output_params['bitrate'] = video_bitrate
-            
-            # Export final video
-            try:
-                # Try MoviePy 2.x syntax first
-                final_video.write_videofile(output_path, **output_params)
-            except TypeError:
-                # Fall back to older syntax if needed
-                output_params['verbose'] = False
-                output_params['logger'] = None
-                final_video.write_videofile(output_path, **output_params)
+                # A target bitrate requires re-encoding the video stream
+                video_params = ['-c:v', 'libx264', '-b:v', video_bitrate]
+            else:
+                # Otherwise copy the video stream as-is (no decode/encode pass)
+                video_params = ['-c:v', 'copy']
             
-            # Clean up
-            video.close()
-            new_audio.close()
-            final_video.close()
+            # Mux the original video stream with the modified audio, fed
+            # to ffmpeg as WAV on stdin
+            wav_buffer = io.BytesIO()
+            result_audio.export(wav_buffer, format='wav')
+            self._run_ffmpeg([
+                '-i', input_path,
+                '-f', 'wav', '-i', 'pipe:0',
+                '-map', '0:v:0', *video_params,
+                '-map', '1:a:0', *audio_params,
+                output_path
+            ], input_data=wav_buffer.getvalue())
             
-            # Verify the file was created
-            if not os.path.exists(output_path):
+            # Verify the file was created and has content
+            try:
+                output_size = os.stat(output_path).st_size
+            except FileNotFoundError:
                 print(f"Error: Output video file was not created at {output_path}")
                 return False
                 
-            if os.path.getsize(output_path) == 0:
+            if output_size == 0:
                 print(f"Error: Output video file is empty at {output_path}")
                 return False
                 
@@ -192,15 +149,52 @@ class VideoEmbedder:
             import traceback
             traceback.print_exc()
             return False
+    
+    def _extract_audio(self, input_path: str) -> AudioSegment:
+        """
+        Decode a video's first audio track to 16-bit PCM in memory.
+        
+        Args:
+            input_path: Path to input video file
             
-        finally:
-            # Clean up temporary files
-            for temp_file in [temp_audio_input, temp_audio_output]:
-                try:
-                    if os.path.exists(temp_file):
-                        os.remove(temp_file)
-                except OSError:
-                    pass  # Ignore cleanup errors
+        Returns:
+            Audio track resampled to the encoder's sample rate
+        """
+        try:
+            wav_data = self._run_ffmpeg([
+                '-i', input_path,
+                '-map', '0:a:0', '-vn',
+                '-c:a', 'pcm_s16le',
+                '-ar', str(self.audio_embedder.encoder.sample_rate),
+                '-f', 'wav', 'pipe:1'
+            ])
+        except RuntimeError as e:
+            if 'matches no streams' in str(e):
+                raise ValueError("Input video has no audio track") from e
+            raise
+        
+        return AudioSegment(data=wav_data)
+    
+    def _run_ffmpeg(self, args: List[str], input_data: Optional[bytes] = None) -> bytes:
+        """
+        Run ffmpeg, overwriting outputs and only reporting errors.
+        
+        Args:
+            args: ffmpeg arguments (inputs, options and output path)
+            input_data: Bytes to feed to ffmpeg's stdin (for 'pipe:0' inputs)
+            
+        Returns:
+            Everything ffmpeg wrote to stdout (for 'pipe:1' outputs)
+        """
+        result = subprocess.run(
+            [FFMPEG_BINARY, '-y', '-v', 'error', *args],
+            input=input_data,
+            stdin=subprocess.DEVNULL if input_data is None else None,
+            capture_output=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg failed: {result.stderr.decode(errors='replace').strip()}")
+        return result.stdout
     
     def embed_video_clip(self,
                          video_clip: VideoFileClip,
@@ -291,7 +285,6 @@ class VideoEmbedder:
                 )
                 
                 # Load as AudioSegment for analysis
-                from pydub import AudioSegment
                 audio = AudioSegment.from_file(temp_audio.name)
                 
                 # Check audio compatibility
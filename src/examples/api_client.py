@@ -6,13 +6,97 @@ This example demonstrates how to interact with the Ultrasonic Agentics HTTP API
 for encoding and decoding operations via REST endpoints.
 """
 
+import asyncio
 import requests
 import json
 import os
+import shutil
+import struct
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import lru_cache
 from io import BytesIO
+from pathlib import Path
+from typing import BinaryIO, Tuple, Union
 import numpy as np
-from pydub import AudioSegment
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+    TOOLBELT_AVAILABLE = True
+except ImportError:
+    TOOLBELT_AVAILABLE = False
+    MultipartEncoder = None
+try:
+    import numexpr
+    # Only worth it when numexpr is built against VML's vectorized sin;
+    # the plain build is no faster than NumPy's in-place ufuncs
+    NUMEXPR_AVAILABLE = bool(numexpr.use_vml)
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+    numexpr = None
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    orjson = None
+try:
+    import httpx
+    HTTPX_AVAILABLE = True
+except ImportError:
+    HTTPX_AVAILABLE = False
+    httpx = None
+try:
+    import h2  # noqa: F401  (enables HTTP/2 support in httpx)
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# In-memory upload: (filename, file object, content type)
+FileTuple = Tuple[str, BinaryIO, str]
+
+# Canonical 44-byte PCM WAV header: RIFF chunk, fmt subchunk, data subchunk
+_WAV_HEADER = struct.Struct('<4sI4s4sIHHIIHH4sI')
+
+# Noise source for synthesized test audio
+_RNG = np.random.default_rng()
+
+# Successful /health and /info responses are reused for this many seconds
+_HEALTH_CACHE_TTL = 600
+
+# Cached probe responses per base URL, shared by every client in the process
+_HEALTH_CACHE = {}
+
+# Uploads are retried by _post_file, not the transport: attempts in total,
+# statuses worth another try, and the base of the exponential backoff (s)
+_UPLOAD_ATTEMPTS = 4
+_UPLOAD_RETRY_STATUSES = frozenset([502, 503, 504])
+_UPLOAD_BACKOFF = 0.2
+
+# Errors raised by the synchronous (requests) and async (httpx) code paths
+_REQUEST_ERRORS = (requests.RequestException,) + ((httpx.HTTPError,) if HTTPX_AVAILABLE else ())
+
+
+def _embed_form(command: str, obfuscate: bool, bitrate: str,
+                ultrasonic_freq: float, amplitude: float) -> dict:
+    """Build the /embed form fields, stringified for every upload path."""
+    return {
+        'command': command,
+        'obfuscate': str(obfuscate),
+        'bitrate': bitrate,
+        'ultrasonic_freq': str(ultrasonic_freq),
+        'amplitude': str(amplitude)
+    }
+
+
+def _parse_json(response) -> dict:
+    """Decode a requests/httpx JSON response, with orjson's parser if available."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(response.content)
+    return response.json()
 
 
 class UltrasonicAgenticsClient:
@@ -21,40 +105,195 @@ class UltrasonicAgenticsClient:
     def __init__(self, base_url: str = "http://localhost:8000"):
         self.base_url = base_url.rstrip('/')
         self.session = requests.Session()
+        self.session.headers['Connection'] = 'keep-alive'
+        
+        # Pool sized for batch workloads, retrying transient gateway errors.
+        # Only idempotent, body-less requests are retried here: a POST body
+        # may be a stream that cannot be replayed by the transport
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=[502, 503, 504],
+                allowed_methods=frozenset(['GET', 'HEAD']),
+                raise_on_status=False
+            )
+        )
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._async_session = None
+        self._probe_cache = _HEALTH_CACHE.setdefault(self.base_url, {})
     
-    def health_check(self) -> dict:
-        """Check if the API service is running."""
+    def health_check(self, force: bool = False) -> dict:
+        """Check if the API service is running (cached unless force is set)."""
         try:
-            response = self.session.get(f"{self.base_url}/health", timeout=5)
-            response.raise_for_status()
-            return response.json()
+            return self._get_cached("/health", force)
         except requests.RequestException as e:
             return {"status": "error", "message": str(e)}
     
-    def get_api_info(self) -> dict:
-        """Get API information and capabilities."""
+    def is_ready(self) -> bool:
+        """Probe readiness with a body-less HEAD request."""
         try:
-            response = self.session.get(f"{self.base_url}/info", timeout=5)
-            response.raise_for_status()
-            return response.json()
+            return self.session.head(f"{self.base_url}/health", timeout=2).ok
+        except requests.RequestException:
+            return False
+    
+    def get_api_info(self, force: bool = False) -> dict:
+        """Get API information and capabilities (cached unless force is set)."""
+        try:
+            return self._get_cached("/info", force)
         except requests.RequestException as e:
             return {"error": str(e)}
     
-    def embed_audio_command(self, audio_file_path: str, command: str, 
+    def _get_cached(self, endpoint: str, force: bool = False) -> dict:
+        """
+        GET a JSON endpoint, reusing a recent successful response.
+        
+        Args:
+            endpoint: API path, e.g. "/health"
+            force: Bypass the cache and always query the server
+            
+        Returns:
+            Decoded JSON response
+        """
+        cached = self._probe_cache.get(endpoint)
+        if not force and cached is not None and time.monotonic() - cached[0] < _HEALTH_CACHE_TTL:
+            return cached[1]
+        
+        response = self.session.get(f"{self.base_url}{endpoint}", timeout=5)
+        response.raise_for_status()
+        payload = _parse_json(response)
+        self._probe_cache[endpoint] = (time.monotonic(), payload)
+        return payload
+    
+    def embed_audio_command(self, audio_file: Union[str, FileTuple], command: str, 
                           obfuscate: bool = True, bitrate: str = "192k",
                           ultrasonic_freq: float = 18500, amplitude: float = 0.1) -> bytes:
-        """Embed command into audio file via API."""
+        """Embed command into audio file (path or (name, fileobj, mimetype)) via API."""
+        data = _embed_form(command, obfuscate, bitrate, ultrasonic_freq, amplitude)
+        
+        response = self._post_file("/embed/audio", audio_file, data)
+        return response.content
+    
+    def embed_audio_command_to_file(self, audio_file: Union[str, FileTuple], command: str,
+                                    output_path: str, obfuscate: bool = True,
+                                    bitrate: str = "192k", ultrasonic_freq: float = 18500,
+                                    amplitude: float = 0.1) -> str:
+        """Embed command via API, streaming the embedded audio straight to output_path."""
+        data = _embed_form(command, obfuscate, bitrate, ultrasonic_freq, amplitude)
+        
+        # Audio does not compress, so ask for an identity body that can be
+        # copied from the socket without a decoding pass
+        response = self._post_file(
+            "/embed/audio", audio_file, data,
+            headers={'Accept-Encoding': 'identity'}, stream=True
+        )
+        with response, open(output_path, 'wb') as f:
+            shutil.copyfileobj(response.raw, f, length=65536)
+        return output_path
+    
+    def decode_audio_command(self, audio_file_path: str) -> dict:
+        """Decode command from audio file via API."""
+        response = self._post_file("/decode/audio", audio_file_path)
+        return _parse_json(response)
+    
+    def decode_audio_bytes(self, audio_bytes: bytes, filename: str = "mem.wav") -> dict:
+        """Decode command from in-memory audio data via API."""
+        response = self._post_file("/decode/audio", (filename, BytesIO(audio_bytes), 'audio/wav'))
+        return _parse_json(response)
+    
+    def analyze_audio(self, audio_file_path: str) -> dict:
+        """Analyze audio file for steganographic content."""
+        response = self._post_file("/analyze/audio", audio_file_path)
+        return _parse_json(response)
+    
+    def analyze_audio_bytes(self, audio_bytes: bytes, filename: str = "mem.wav") -> dict:
+        """Analyze in-memory audio data for steganographic content."""
+        response = self._post_file("/analyze/audio", (filename, BytesIO(audio_bytes), 'audio/wav'))
+        return _parse_json(response)
+    
+    def _post_file(self, endpoint: str, audio_file: Union[str, FileTuple],
+                   data: dict = None, headers: dict = None,
+                   stream: bool = False) -> requests.Response:
+        """
+        Upload an audio file, plus optional form fields, to an API endpoint.
+        
+        With requests-toolbelt available the multipart body is streamed from
+        disk in chunks instead of being built in memory before sending.
+        
+        Args:
+            endpoint: API path, e.g. "/embed/audio"
+            audio_file: Path to the audio file, or a (filename, fileobj,
+                content_type) tuple for data that is already open or in memory
+            data: Additional form fields
+            headers: Additional request headers
+            stream: Leave the response body unread for the caller to stream
+            
+        Returns:
+            The successful response
+        """
+        url = f"{self.base_url}{endpoint}"
+        
+        with ExitStack() as stack:
+            if isinstance(audio_file, tuple):
+                file_field = audio_file
+            else:
+                f = stack.enter_context(open(audio_file, 'rb'))
+                file_field = (os.path.basename(audio_file), f, 'audio/wav')
+            
+            # A streamed body cannot be replayed, so each retry rewinds the
+            # file and builds a new body; unseekable files get one attempt
+            file_obj = file_field[1]
+            start = file_obj.tell() if file_obj.seekable() else None
+            attempts = _UPLOAD_ATTEMPTS if start is not None else 1
+            
+            for attempt in range(attempts):
+                if attempt:
+                    response.close()
+                    time.sleep(_UPLOAD_BACKOFF * 2 ** (attempt - 1))
+                    file_obj.seek(start)
+                
+                response = self._send_upload(url, file_field, data, headers, stream)
+                if response.status_code not in _UPLOAD_RETRY_STATUSES:
+                    break
+        
+        response.raise_for_status()
+        return response
+    
+    def _send_upload(self, url: str, file_field: FileTuple, data: dict,
+                     headers: dict, stream: bool) -> requests.Response:
+        """Send one multipart upload attempt, streamed if requests-toolbelt is available."""
+        if TOOLBELT_AVAILABLE:
+            encoder = MultipartEncoder(fields={**(data or {}), 'file': file_field})
+            return self.session.post(
+                url,
+                data=encoder,
+                headers={**(headers or {}), 'Content-Type': encoder.content_type},
+                stream=stream,
+                timeout=30
+            )
+        
+        return self.session.post(
+            url,
+            files={'file': file_field},
+            data=data,
+            headers=headers,
+            stream=stream,
+            timeout=30
+        )
+    
+    async def aembed_audio_command(self, audio_file_path: str, command: str,
+                                   obfuscate: bool = True, bitrate: str = "192k",
+                                   ultrasonic_freq: float = 18500, amplitude: float = 0.1) -> bytes:
+        """Embed command into audio file via API without blocking the event loop."""
+        session = self._get_async_session()
         with open(audio_file_path, 'rb') as f:
             files = {'file': (os.path.basename(audio_file_path), f, 'audio/wav')}
-            data = {
-                'command': command,
-                'obfuscate': obfuscate,
-                'bitrate': bitrate,
-                'ultrasonic_freq': ultrasonic_freq,
-                'amplitude': amplitude
-            }
+            data = _embed_form(command, obfuscate, bitrate, ultrasonic_freq, amplitude)
             
-            response = self.session.post(
+            response = await session.post(
                 f"{self.base_url}/embed/audio",
                 files=files,
                 data=data,
@@ -63,31 +302,54 @@ class UltrasonicAgenticsClient:
             response.raise_for_status()
             return response.content
     
-    def decode_audio_command(self, audio_file_path: str) -> dict:
-        """Decode command from audio file via API."""
+    async def adecode_audio_command(self, audio_file_path: str) -> dict:
+        """Decode command from audio file via API without blocking the event loop."""
+        session = self._get_async_session()
         with open(audio_file_path, 'rb') as f:
             files = {'file': (os.path.basename(audio_file_path), f, 'audio/wav')}
             
-            response = self.session.post(
+            response = await session.post(
                 f"{self.base_url}/decode/audio",
                 files=files,
                 timeout=30
             )
             response.raise_for_status()
-            return response.json()
-    
-    def analyze_audio(self, audio_file_path: str) -> dict:
-        """Analyze audio file for steganographic content."""
-        with open(audio_file_path, 'rb') as f:
-            files = {'file': (os.path.basename(audio_file_path), f, 'audio/wav')}
-            
-            response = self.session.post(
-                f"{self.base_url}/analyze/audio",
-                files=files,
-                timeout=30
+            return _parse_json(response)
+    
+    async def adecode_audio_bytes(self, audio_bytes: bytes, filename: str = "mem.wav") -> dict:
+        """Decode command from in-memory audio data via API without blocking the event loop."""
+        session = self._get_async_session()
+        response = await session.post(
+            f"{self.base_url}/decode/audio",
+            files={'file': (filename, audio_bytes, 'audio/wav')},
+            timeout=30
+        )
+        response.raise_for_status()
+        return _parse_json(response)
+    
+    async def aclose(self) -> None:
+        """Close the async session; it is recreated on the next async call."""
+        if self._async_session is not None:
+            await self._async_session.aclose()
+            self._async_session = None
+    
+    def _get_async_session(self):
+        """Lazily create the async session, bound to the running event loop."""
+        if not HTTPX_AVAILABLE:
+            raise ImportError("httpx is required for async API requests but not available")
+        
+        if self._async_session is None:
+            # HTTP/2 multiplexes concurrent requests over a single connection
+            # when both h2 and the server support it
+            self._async_session = httpx.AsyncClient(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=16,
+                    max_keepalive_connections=16,
+                    keepalive_expiry=600
+                )
             )
-            response.raise_for_status()
-            return response.json()
+        return self._async_session
     
     def configure_frequencies(self, freq_0: float, freq_1: float) -> dict:
         """Configure ultrasonic frequencies."""
@@ -102,7 +364,7 @@ class UltrasonicAgenticsClient:
             timeout=10
         )
         response.raise_for_status()
-        return response.json()
+        return _parse_json(response)
     
     def configure_encryption_key(self, key_base64: str) -> dict:
         """Configure encryption key."""
@@ -114,47 +376,87 @@ class UltrasonicAgenticsClient:
             timeout=10
         )
         response.raise_for_status()
-        return response.json()
+        return _parse_json(response)
 
 
-def create_test_audio_file(filename: str = "test_audio.wav") -> str:
-    """Create a test audio file for API demonstrations."""
-    duration = 5.0
-    sample_rate = 44100
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
+def _synthesize_tone(t: np.ndarray, freq: float, amplitude: float,
+                     out: np.ndarray = None) -> np.ndarray:
+    """Compute amplitude * sin(2*pi*freq*t) in place, without temporaries."""
+    if NUMEXPR_AVAILABLE:
+        # Single fused pass using VML's vectorized sin
+        return numexpr.evaluate(
+            'amplitude * sin(omega * t)',
+            local_dict={'amplitude': amplitude, 'omega': 2 * np.pi * freq, 't': t},
+            out=out
+        )
     
-    # Create a simple musical phrase
-    audio = (
-        0.3 * np.sin(2 * np.pi * 261.63 * t) +  # C note
-        0.2 * np.sin(2 * np.pi * 329.63 * t) +  # E note
-        0.1 * np.random.normal(0, 0.02, len(t))  # Background noise
+    out = np.multiply(t, 2 * np.pi * freq, out=out)
+    np.sin(out, out=out)
+    out *= amplitude
+    return out
+
+
+def _encode_wav(audio: np.ndarray, sample_rate: int) -> memoryview:
+    """
+    Encode [-1, 1] float samples as a mono 16-bit PCM WAV file image.
+    
+    The header is packed by hand and the int16 conversion writes straight
+    into the buffer after it, so no intermediate sample array or bytes copy
+    is made.
+    
+    Args:
+        audio: Mono float samples in [-1, 1]
+        sample_rate: Sample rate in Hz
+        
+    Returns:
+        Read-only view of the complete WAV file
+    """
+    data_size = audio.size * 2
+    buffer = bytearray(_WAV_HEADER.size + data_size)
+    _WAV_HEADER.pack_into(
+        buffer, 0,
+        b'RIFF', _WAV_HEADER.size - 8 + data_size, b'WAVE',
+        b'fmt ', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16,
+        b'data', data_size
     )
+    samples = np.frombuffer(buffer, dtype='<i2', offset=_WAV_HEADER.size)
+    np.multiply(audio, 32767, out=samples, casting='unsafe')
+    return memoryview(buffer).toreadonly()
+
+
+@lru_cache(maxsize=8)
+def _build_wav_bytes(duration: float, sample_rate: int) -> memoryview:
+    """Synthesize the test phrase once per (duration, sample_rate) as WAV bytes."""
+    t = np.linspace(0, duration, int(sample_rate * duration), False)
     
-    # Convert to AudioSegment and save
-    audio_int16 = (audio * 32767).astype(np.int16)
-    audio_segment = AudioSegment(
-        audio_int16.tobytes(),
-        frame_rate=sample_rate,
-        sample_width=2,
-        channels=1
-    )
+    # Create a simple musical phrase, reusing two buffers for all the terms
+    audio = _synthesize_tone(t, 261.63, 0.3)  # C note
+    scratch = _synthesize_tone(t, 329.63, 0.2, out=np.empty_like(t))  # E note
+    audio += scratch
+    _RNG.standard_normal(out=scratch)  # Background noise
+    scratch *= 0.1 * 0.02
+    audio += scratch
     
-    audio_segment.export(filename, format="wav")
+    # Convert to 16-bit PCM
+    return _encode_wav(audio, sample_rate)
+
+
+def create_test_audio_file(filename: str = "test_audio.wav") -> str:
+    """Create a test audio file for API demonstrations."""
+    Path(filename).write_bytes(_build_wav_bytes(5.0, 44100))
     print(f"Created test audio file: {filename}")
     return filename
 
 
-def test_api_connection():
+def test_api_connection(client: UltrasonicAgenticsClient):
     """Test basic API connectivity."""
     print("=== Testing API Connection ===")
     
-    client = UltrasonicAgenticsClient()
-    
-    # Health check
-    health = client.health_check()
-    print(f"Health check: {health}")
+    # Readiness probe
+    ready = client.is_ready()
+    print(f"Ready: {ready}")
     
-    if health.get("status") == "healthy":
+    if ready:
         print("✓ API is running and accessible")
         
         # Get API info
@@ -167,12 +469,10 @@ def test_api_connection():
         return False
 
 
-def test_audio_embedding_api():
+def test_audio_embedding_api(client: UltrasonicAgenticsClient):
     """Test audio embedding via API."""
     print("\n=== Testing Audio Embedding API ===")
     
-    client = UltrasonicAgenticsClient()
-    
     # Create test audio
     test_file = create_test_audio_file("api_test_input.wav")
     
@@ -189,16 +489,10 @@ def test_audio_embedding_api():
             amplitude=0.15
         )
         
-        # Save embedded audio
-        output_file = "api_test_embedded.wav"
-        with open(output_file, 'wb') as f:
-            f.write(embedded_audio_data)
-        
         print(f"✓ Command embedded successfully")
-        print(f"Saved embedded audio: {output_file}")
         
-        # Test decoding
-        decode_result = client.decode_audio_command(output_file)
+        # Test decoding, handing the embedded audio over in memory
+        decode_result = client.decode_audio_bytes(embedded_audio_data, "api_test_embedded.wav")
         print(f"Decode result: {json.dumps(decode_result, indent=2)}")
         
         if decode_result.get("success") and decode_result.get("command") == command:
@@ -207,19 +501,17 @@ def test_audio_embedding_api():
             print("✗ Command decoding failed")
         
         # Clean up
-        cleanup_files([test_file, output_file])
+        cleanup_files([test_file])
         
     except requests.RequestException as e:
         print(f"✗ API request failed: {e}")
         cleanup_files([test_file])
 
 
-def test_audio_analysis_api():
+def test_audio_analysis_api(client: UltrasonicAgenticsClient):
     """Test audio analysis via API."""
     print("\n=== Testing Audio Analysis API ===")
     
-    client = UltrasonicAgenticsClient()
-    
     # Create test audio with embedded command
     test_file = create_test_audio_file("analysis_test.wav")
     
@@ -231,12 +523,8 @@ def test_audio_analysis_api():
             amplitude=0.2
         )
         
-        embedded_file = "analysis_embedded.wav"
-        with open(embedded_file, 'wb') as f:
-            f.write(embedded_data)
-        
         # Analyze the embedded audio
-        analysis_result = client.analyze_audio(embedded_file)
+        analysis_result = client.analyze_audio_bytes(embedded_data, "analysis_embedded.wav")
         print(f"Analysis result: {json.dumps(analysis_result, indent=2)}")
         
         # Check analysis results
@@ -249,19 +537,17 @@ def test_audio_analysis_api():
             print("✗ Audio analysis failed")
         
         # Clean up
-        cleanup_files([test_file, embedded_file])
+        cleanup_files([test_file])
         
     except requests.RequestException as e:
         print(f"✗ API request failed: {e}")
         cleanup_files([test_file])
 
 
-def test_configuration_api():
+def test_configuration_api(client: UltrasonicAgenticsClient):
     """Test API configuration endpoints."""
     print("\n=== Testing Configuration API ===")
     
-    client = UltrasonicAgenticsClient()
-    
     try:
         # Test frequency configuration
         print("Testing frequency configuration...")
@@ -282,11 +568,7 @@ def test_configuration_api():
             ultrasonic_freq=20000
         )
         
-        embedded_file = "freq_test_embedded.wav"
-        with open(embedded_file, 'wb') as f:
-            f.write(embedded_data)
-        
-        decode_result = client.decode_audio_command(embedded_file)
+        decode_result = client.decode_audio_bytes(embedded_data, "freq_test_embedded.wav")
         
         if decode_result.get("success"):
             print("✓ New frequency configuration works correctly")
@@ -297,21 +579,20 @@ def test_configuration_api():
         client.configure_frequencies(18500, 19500)
         
         # Clean up
-        cleanup_files([test_file, embedded_file])
+        cleanup_files([test_file])
         
     except requests.RequestException as e:
         print(f"✗ Configuration API request failed: {e}")
 
 
-def test_batch_api_operations():
+def test_batch_api_operations(client: UltrasonicAgenticsClient):
     """Test batch operations via API."""
     print("\n=== Testing Batch API Operations ===")
     
-    client = UltrasonicAgenticsClient()
-    
     # Create multiple test files
     test_files = []
     commands = ["batch:cmd1", "batch:cmd2", "batch:cmd3"]
+    embedded_files = [f"batch_embedded_{i+1}.wav" for i in range(len(commands))]
     
     try:
         print("Creating batch test files...")
@@ -320,30 +601,27 @@ def test_batch_api_operations():
             test_files.append(input_file)
             create_test_audio_file(input_file)
         
-        # Process each file
-        embedded_files = []
-        for i, (input_file, command) in enumerate(zip(test_files, commands)):
-            print(f"Processing {input_file} with command: {command}")
-            
-            # Embed command
-            embedded_data = client.embed_audio_command(
-                input_file,
-                command,
-                amplitude=0.18
-            )
-            
-            # Save embedded file
-            embedded_file = f"batch_embedded_{i+1}.wav"
-            embedded_files.append(embedded_file)
-            with open(embedded_file, 'wb') as f:
-                f.write(embedded_data)
-        
-        # Decode all files
-        print("Decoding batch files...")
+        # Embed and decode all files concurrently, passing each embedded
+        # result straight from the embed response into its decode request
+        async def _process(input_file, command, embedded_file):
+            embedded_data = await client.aembed_audio_command(input_file, command, amplitude=0.18)
+            return await client.adecode_audio_bytes(embedded_data, embedded_file)
+        
+        async def _run():
+            try:
+                return await asyncio.gather(*[
+                    _process(input_file, command, embedded_file)
+                    for input_file, command, embedded_file
+                    in zip(test_files, commands, embedded_files)
+                ])
+            finally:
+                await client.aclose()
+        
+        print("Embedding and decoding batch files...")
+        decode_results = asyncio.run(_run())
+        
         success_count = 0
-        for i, (embedded_file, expected_command) in enumerate(zip(embedded_files, commands)):
-            decode_result = client.decode_audio_command(embedded_file)
-            
+        for embedded_file, expected_command, decode_result in zip(embedded_files, commands, decode_results):
             if decode_result.get("success") and decode_result.get("command") == expected_command:
                 print(f"  ✓ {embedded_file}: {decode_result['command']}")
                 success_count += 1
@@ -353,25 +631,20 @@ def test_batch_api_operations():
         print(f"Batch processing results: {success_count}/{len(commands)} successful")
         
         # Clean up
-        cleanup_files(test_files + embedded_files)
+        cleanup_files(test_files)
         
-    except requests.RequestException as e:
+    except _REQUEST_ERRORS as e:
         print(f"✗ Batch API operations failed: {e}")
         cleanup_files(test_files)
 
 
-def test_error_handling():
+def test_error_handling(client: UltrasonicAgenticsClient):
     """Test API error handling with invalid inputs."""
     print("\n=== Testing API Error Handling ===")
     
-    client = UltrasonicAgenticsClient()
-    
-    # Test invalid file upload
+    # Test invalid file upload, sending a text payload straight from memory
     try:
-        # Create a text file instead of audio
-        invalid_file = "invalid_audio.txt"
-        with open(invalid_file, 'w') as f:
-            f.write("This is not an audio file")
+        invalid_file = ('invalid_audio.txt', BytesIO(b"This is not an audio file"), 'text/plain')
         
         print("Testing invalid file format...")
         try:
@@ -380,8 +653,6 @@ def test_error_handling():
         except requests.HTTPError as e:
             print(f"✓ Correctly rejected invalid file: {e.response.status_code}")
         
-        os.remove(invalid_file)
-        
     except Exception as e:
         print(f"Error in invalid file test: {e}")
     
@@ -403,12 +674,10 @@ def test_error_handling():
         print(f"✓ Correctly returned 404 for non-existent endpoint: {e.response.status_code}")
 
 
-def performance_test():
+def performance_test(client: UltrasonicAgenticsClient):
     """Test API performance with various file sizes."""
     print("\n=== Testing API Performance ===")
     
-    client = UltrasonicAgenticsClient()
-    
     durations = [1, 3, 5, 10]  # seconds
     
     for duration in durations:
@@ -417,56 +686,36 @@ def performance_test():
         # Create test audio of specific duration
         sample_rate = 44100
         t = np.linspace(0, duration, int(sample_rate * duration), False)
-        audio = 0.3 * np.sin(2 * np.pi * 440 * t)
-        
-        audio_int16 = (audio * 32767).astype(np.int16)
-        audio_segment = AudioSegment(
-            audio_int16.tobytes(),
-            frame_rate=sample_rate,
-            sample_width=2,
-            channels=1
-        )
+        audio = _synthesize_tone(t, 440, 0.3)
         
-        test_file = f"perf_test_{duration}s.wav"
-        audio_segment.export(test_file, format="wav")
+        wav_bytes = _encode_wav(audio, sample_rate)
         
         try:
-            # Measure embedding time
-            start_time = time.time()
+            # Upload from memory and decode the response bytes directly, so no
+            # disk round-trips fall inside the timed sections
+            start_ns = time.perf_counter_ns()
             embedded_data = client.embed_audio_command(
-                test_file,
+                (f"perf_test_{duration}s.wav", BytesIO(wav_bytes), 'audio/wav'),
                 f"perf:test_{duration}s"
             )
-            embed_time = time.time() - start_time
-            
-            # Save and measure decoding time
-            embedded_file = f"perf_embedded_{duration}s.wav"
-            with open(embedded_file, 'wb') as f:
-                f.write(embedded_data)
-            
-            start_time = time.time()
-            decode_result = client.decode_audio_command(embedded_file)
-            decode_time = time.time() - start_time
+            embed_ns = time.perf_counter_ns()
+            decode_result = client.decode_audio_bytes(embedded_data)
+            decode_ns = time.perf_counter_ns()
             
-            print(f"  File size: {os.path.getsize(test_file) / 1024:.1f} KB")
-            print(f"  Embed time: {embed_time:.2f}s")
-            print(f"  Decode time: {decode_time:.2f}s")
+            print(f"  File size: {len(wav_bytes) / 1024:.1f} KB")
+            print(f"  Embed time: {(embed_ns - start_ns) / 1e9:.2f}s")
+            print(f"  Decode time: {(decode_ns - embed_ns) / 1e9:.2f}s")
             print(f"  Success: {decode_result.get('success', False)}")
             
-            # Clean up
-            cleanup_files([test_file, embedded_file])
-            
         except Exception as e:
             print(f"  ✗ Performance test failed: {e}")
-            cleanup_files([test_file])
 
 
 def cleanup_files(file_list):
     """Clean up temporary files."""
     for file_path in file_list:
         try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
+            Path(file_path).unlink(missing_ok=True)
         except OSError:
             pass
 
@@ -478,15 +727,27 @@ if __name__ == "__main__":
     print("  python -m ultrasonic_agentics.server")
     print("=" * 50)
     
+    # Share one client so every test reuses the same connection pool
+    client = UltrasonicAgenticsClient()
+    
     # Test API connectivity first
-    if test_api_connection():
+    if test_api_connection(client):
         # Run all API tests
-        test_audio_embedding_api()
-        test_audio_analysis_api()
-        test_configuration_api()
-        test_batch_api_operations()
-        test_error_handling()
-        performance_test()
+        # Embedding and analysis are independent; run them side by side over
+        # the shared connection pool. Configuration changes server state, so
+        # it runs on its own afterwards.
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [
+                pool.submit(test_audio_embedding_api, client),
+                pool.submit(test_audio_analysis_api, client)
+            ]
+            for future in futures:
+                future.result()
+        
+        test_configuration_api(client)
+        test_batch_api_operations(client)
+        test_error_handling(client)
+        performance_test(client)
         
         print("\n" + "=" * 50)
         print("API client examples completed!")
@@ -7,12 +7,113 @@ including mixing with existing audio content.
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from functools import lru_cache
 import numpy as np
 from pydub import AudioSegment
+from scipy.io import wavfile
 from ultrasonic_agentics.embed.ultrasonic_encoder import UltrasonicEncoder
 from ultrasonic_agentics.decode.ultrasonic_decoder import UltrasonicDecoder
 
 
+# Shared noise source for all synthesized example audio
+_RNG = np.random.default_rng(0)
+
+
+@lru_cache(maxsize=32)
+def _get_encoder(**params) -> UltrasonicEncoder:
+    """
+    Get the cached encoder for these keyword arguments.
+    
+    The file-processing examples share one instance per parameter set, so the
+    encoder must not be reconfigured in place. Ask for a different parameter
+    set instead of calling set_frequencies() or set_amplitude().
+    """
+    return UltrasonicEncoder(**params)
+
+
+@lru_cache(maxsize=32)
+def _get_decoder(**params) -> UltrasonicDecoder:
+    """
+    Get the cached decoder for these keyword arguments.
+    
+    Decoders are shared across the file-processing examples the same way as
+    encoders, so never call set_frequencies() or set_detection_threshold()
+    on the returned instance.
+    """
+    return UltrasonicDecoder(**params)
+
+
+@lru_cache(maxsize=8)
+def _time_axis(sample_rate: int, duration: float) -> np.ndarray:
+    """Get the shared, read-only float32 sample-time axis for a clip."""
+    t = np.linspace(0, duration, int(sample_rate * duration), False, dtype=np.float32)
+    t.setflags(write=False)
+    return t
+
+
+def _tone_matrix(t: np.ndarray, freqs) -> np.ndarray:
+    """Evaluate sin(2*pi*f*t) for every frequency in one pass over a stacked phase matrix."""
+    phases = np.multiply.outer(2 * np.pi * np.asarray(freqs, dtype=np.float32), t)
+    return np.sin(phases, out=phases)
+
+
+def _synthesize_tones(t: np.ndarray, freqs, amps, envelopes: np.ndarray = None) -> np.ndarray:
+    """Mix sine tones as amps @ sin(phases), optionally shaping each tone by an envelope row."""
+    tones = _tone_matrix(t, freqs)
+    if envelopes is not None:
+        tones *= envelopes
+    return np.asarray(amps, dtype=np.float32) @ tones
+
+
+def _gaussian_noise(shape, sigma: float, out: np.ndarray = None) -> np.ndarray:
+    """Draw float32 Gaussian noise with standard deviation sigma, optionally into out."""
+    if out is None:
+        out = np.empty(shape, dtype=np.float32)
+    _RNG.standard_normal(dtype=np.float32, out=out)
+    out *= np.float32(sigma)
+    return out
+
+
+def float_to_pcm16(audio: np.ndarray, out: np.ndarray = None) -> np.ndarray:
+    """Quantize [-1, 1] float samples to int16 PCM with rounding and clipping."""
+    scaled = np.multiply(audio, np.float32(32767), dtype=np.float32)
+    np.rint(scaled, out=scaled)
+    np.clip(scaled, -32768, 32767, out=scaled)
+    
+    if out is None:
+        out = np.empty(scaled.shape, dtype=np.int16)
+    np.copyto(out, scaled, casting='unsafe')
+    return out
+
+
+def _pcm16_to_float(pcm: np.ndarray) -> np.ndarray:
+    """Convert int16 PCM samples to float32 in [-1, 1] with a single cast."""
+    samples = pcm.astype(np.float32)
+    samples *= np.float32(1 / 32767)
+    return samples
+
+
+def _segment_to_float(segment: AudioSegment) -> np.ndarray:
+    """Get a 16-bit AudioSegment's samples as mono float32, viewing its raw bytes directly."""
+    pcm = np.frombuffer(segment.raw_data, dtype=np.int16)
+    
+    # Handle stereo if necessary
+    if segment.channels == 2:
+        # Convert stereo to mono by averaging channels
+        return _stereo_to_mono_float(pcm)
+    
+    return _pcm16_to_float(pcm)
+
+
+def _stereo_to_mono_float(pcm: np.ndarray) -> np.ndarray:
+    """Average interleaved int16 stereo into mono float32 in [-1, 1] in one fused pass."""
+    mono = np.add(pcm[0::2], pcm[1::2], dtype=np.float32)
+    mono *= np.float32(0.5 / 32767)
+    return mono
+
+
 def create_test_audio():
     """Create a test audio file with some background content."""
     print("Creating test audio file...")
@@ -20,34 +121,23 @@ def create_test_audio():
     # Generate a simple audio track (sine wave with some complexity)
     duration = 5.0  # 5 seconds
     sample_rate = 44100
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
+    t = _time_axis(sample_rate, duration)
     
-    # Create a multi-frequency audio signal
-    audio = (
-        0.3 * np.sin(2 * np.pi * 440 * t) +      # A note
-        0.2 * np.sin(2 * np.pi * 660 * t) +      # E note
-        0.1 * np.sin(2 * np.pi * 880 * t)        # High A
-    )
+    # Create a multi-frequency audio signal: A note, E note, high A
+    audio = _synthesize_tones(t, [440, 660, 880], [0.3, 0.2, 0.1])
     
     # Add some noise for realism
-    noise = np.random.normal(0, 0.02, len(audio))
-    audio += noise
+    audio += _gaussian_noise(len(audio), 0.02)
     
-    # Convert to int16 and create AudioSegment
-    audio_int16 = (audio * 32767).astype(np.int16)
-    audio_segment = AudioSegment(
-        audio_int16.tobytes(),
-        frame_rate=sample_rate,
-        sample_width=2,
-        channels=1
-    )
+    # Convert to int16
+    audio_int16 = float_to_pcm16(audio)
     
     # Save test file
     test_file = "test_background_audio.wav"
-    audio_segment.export(test_file, format="wav")
+    wavfile.write(test_file, sample_rate, audio_int16)
     print(f"Created test audio: {test_file} ({duration}s)")
     
-    return test_file, audio_segment
+    return test_file, audio_int16
 
 
 def embed_command_in_audio():
@@ -55,10 +145,10 @@ def embed_command_in_audio():
     print("\n=== Embedding Command in Audio File ===")
     
     # Create test audio
-    test_file, original_audio = create_test_audio()
+    test_file, original_pcm = create_test_audio()
     
     # Initialize encoder
-    encoder = UltrasonicEncoder(
+    encoder = _get_encoder(
         freq_0=19000,
         freq_1=20000,
         sample_rate=44100,  # Match the test audio
@@ -73,27 +163,21 @@ def embed_command_in_audio():
     encoded_signal = encoder.encode_payload(command.encode())
     
     # Load original audio as numpy array
-    original_samples = np.array(original_audio.get_array_of_samples()).astype(np.float32) / 32767.0
+    original_samples = _pcm16_to_float(original_pcm)
     
     # Mix the encoded signal with the original audio
     mixed_audio = mix_audio_signals(original_samples, encoded_signal, encoder.sample_rate)
     
-    # Convert back to AudioSegment
-    mixed_int16 = (mixed_audio * 32767).astype(np.int16)
-    mixed_segment = AudioSegment(
-        mixed_int16.tobytes(),
-        frame_rate=encoder.sample_rate,
-        sample_width=2,
-        channels=1
-    )
+    # Convert back to int16
+    mixed_int16 = float_to_pcm16(mixed_audio)
     
     # Save mixed audio
     output_file = "audio_with_embedded_command.wav"
-    mixed_segment.export(output_file, format="wav")
+    wavfile.write(output_file, encoder.sample_rate, mixed_int16)
     print(f"Saved mixed audio: {output_file}")
     
     # Test decoding
-    decoder = UltrasonicDecoder(
+    decoder = _get_decoder(
         freq_0=encoder.freq_0,
         freq_1=encoder.freq_1,
         sample_rate=encoder.sample_rate,
@@ -119,26 +203,29 @@ def embed_command_in_audio():
     return output_file if decoded_bytes else None
 
 
-def mix_audio_signals(background: np.ndarray, ultrasonic: np.ndarray, sample_rate: int) -> np.ndarray:
-    """Mix background audio with ultrasonic signal."""
-    # Ensure both signals have the same length
-    max_length = max(len(background), len(ultrasonic))
-    
-    # Pad shorter signal with zeros
-    if len(background) < max_length:
-        background = np.pad(background, (0, max_length - len(background)))
-    if len(ultrasonic) < max_length:
-        ultrasonic = np.pad(ultrasonic, (0, max_length - len(ultrasonic)))
+def mix_audio_signals(background: np.ndarray, ultrasonic: np.ndarray, sample_rate: int,
+                      out: np.ndarray = None) -> np.ndarray:
+    """Mix background audio with ultrasonic signal, optionally into a preallocated out buffer."""
+    # The mix is as long as the longer signal; the shorter one is implicitly
+    # zero-padded by only adding it over its own length
+    longer, shorter = (background, ultrasonic) if len(background) >= len(ultrasonic) else (ultrasonic, background)
+    
+    if out is None:
+        out = np.empty(len(longer), dtype=np.result_type(background, ultrasonic))
+    else:
+        out = out[:len(longer)]
     
     # Mix signals (simple addition)
-    mixed = background + ultrasonic
+    np.copyto(out, longer)
+    head = out[:len(shorter)]
+    np.add(head, shorter, out=head)
     
     # Normalize to prevent clipping
-    max_amplitude = np.max(np.abs(mixed))
+    max_amplitude = max(out.max(), -out.min())
     if max_amplitude > 1.0:
-        mixed = mixed / max_amplitude * 0.95  # Leave some headroom
+        np.multiply(out, out.dtype.type(0.95) / max_amplitude, out=out)  # Leave some headroom
     
-    return mixed
+    return out
 
 
 def steganographic_embedding():
@@ -148,20 +235,26 @@ def steganographic_embedding():
     # Create longer background audio
     duration = 10.0
     sample_rate = 48000
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-    
-    # Create more complex background (music-like)
-    background = (
-        0.4 * np.sin(2 * np.pi * 261.63 * t) * np.exp(-t * 0.5) +  # C note decay
-        0.3 * np.sin(2 * np.pi * 329.63 * t) * np.exp(-(t-1) * 0.5) * (t > 1) +  # E note
-        0.2 * np.sin(2 * np.pi * 392.00 * t) * np.exp(-(t-2) * 0.5) * (t > 2)    # G note
-    )
+    t = _time_axis(sample_rate, duration)
+    
+    # Create more complex background (music-like): C, E and G notes that
+    # start at 0s, 1s and 2s and each decay exponentially from their onset
+    onsets = [0.0, 1.0, 2.0]
+    envelopes = np.zeros((len(onsets), len(t)), dtype=np.float32)
+    for envelope, onset in zip(envelopes, onsets):
+        # Silent up to the onset; only the decaying tail is computed, in place
+        start = np.searchsorted(t, onset, side='right')
+        tail = envelope[start:]
+        np.subtract(t[start:], np.float32(onset), out=tail)
+        tail *= np.float32(-0.5)
+        np.exp(tail, out=tail)
+    background = _synthesize_tones(t, [261.63, 329.63, 392.00], [0.4, 0.3, 0.2], envelopes)
     
     # Add realistic noise
-    background += np.random.normal(0, 0.01, len(background))
+    background += _gaussian_noise(len(background), 0.01)
     
     # Initialize encoder with very low amplitude for steganography
-    encoder = UltrasonicEncoder(
+    encoder = _get_encoder(
         freq_0=20500,
         freq_1=21500,
         sample_rate=sample_rate,
@@ -176,7 +269,8 @@ def steganographic_embedding():
     
     # Embed at a random position in the audio
     embed_position = int(len(background) * 0.3)  # 30% into the audio
-    mixed_audio = background.copy()
+    # The background is not used again, so the signal is added in place
+    mixed_audio = background
     
     # Ensure we don't exceed array bounds
     end_position = min(embed_position + len(encoded_signal), len(mixed_audio))
@@ -185,20 +279,14 @@ def steganographic_embedding():
     mixed_audio[embed_position:end_position] += encoded_signal[:actual_signal_length]
     
     # Save steganographic audio
-    stego_int16 = (mixed_audio * 32767).astype(np.int16)
-    stego_segment = AudioSegment(
-        stego_int16.tobytes(),
-        frame_rate=sample_rate,
-        sample_width=2,
-        channels=1
-    )
+    stego_int16 = float_to_pcm16(mixed_audio)
     
     stego_file = "steganographic_audio.wav"
-    stego_segment.export(stego_file, format="wav")
+    wavfile.write(stego_file, sample_rate, stego_int16)
     print(f"Saved steganographic audio: {stego_file}")
     
     # Test detection and decoding
-    decoder = UltrasonicDecoder(
+    decoder = _get_decoder(
         freq_0=encoder.freq_0,
         freq_1=encoder.freq_1,
         sample_rate=sample_rate,
@@ -237,61 +325,59 @@ def batch_processing_example():
     print("\n=== Batch Processing Example ===")
     
     # Create multiple test files
-    test_files = []
     commands = [
         "batch:file_1",
         "batch:file_2", 
         "batch:file_3"
     ]
     
-    encoder = UltrasonicEncoder(amplitude=0.2)
+    encoder = _get_encoder(amplitude=0.2)
+    
+    # Create unique audio for each file: a different frequency per file
+    # (440, 880, 1320 Hz), all synthesized in one pass
+    duration = 3.0
+    sample_rate = 44100
+    t = _time_axis(sample_rate, duration)
+    backgrounds = _tone_matrix(t, [440 * (i + 1) for i in range(len(commands))])
+    backgrounds *= np.float32(0.3)
+    backgrounds += _gaussian_noise(backgrounds.shape, 0.02)
+    
+    # Encode every command up front so the mix and PCM buffers can be
+    # allocated once, at the longest length, with one row per file so that
+    # concurrent workers never share a buffer
+    encoded_signals = [encoder.encode_payload(command.encode()) for command in commands]
+    max_length = max(len(t), *(len(signal) for signal in encoded_signals))
+    mixed_scratch = np.empty((len(commands), max_length), dtype=np.float32)
+    pcm_scratch = np.empty((len(commands), max_length), dtype=np.int16)
+    
+    # Files are independent; NumPy and the WAV file I/O release the GIL for
+    # their heavy lifting, so a thread pool overlaps them
+    max_workers = os.cpu_count() or 1
     
     print("Creating batch of test files...")
-    for i, command in enumerate(commands):
-        # Create unique audio for each file
-        duration = 3.0
-        sample_rate = 44100
-        t = np.linspace(0, duration, int(sample_rate * duration), False)
-        
-        # Different frequency for each file
-        freq = 440 * (i + 1)  # 440, 880, 1320 Hz
-        audio = 0.3 * np.sin(2 * np.pi * freq * t)
-        audio += np.random.normal(0, 0.02, len(audio))
-        
-        # Embed command
-        encoded_signal = encoder.encode_payload(command.encode())
-        mixed_audio = mix_audio_signals(audio, encoded_signal, sample_rate)
-        
-        # Save file
-        filename = f"batch_test_{i+1}.wav"
-        mixed_int16 = (mixed_audio * 32767).astype(np.int16)
-        audio_segment = AudioSegment(
-            mixed_int16.tobytes(),
-            frame_rate=sample_rate,
-            sample_width=2,
-            channels=1
-        )
-        audio_segment.export(filename, format="wav")
-        test_files.append(filename)
+    test_files = [f"batch_test_{i+1}.wav" for i in range(len(commands))]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        list(executor.map(
+            lambda i: _save_batch_file(test_files[i], backgrounds[i], encoded_signals[i],
+                                       sample_rate, mixed_scratch[i], pcm_scratch[i]),
+            range(len(commands))
+        ))
+    for filename, command in zip(test_files, commands):
         print(f"  Created {filename} with command: {command}")
     
     # Batch decode all files
     print("\nDecoding batch files...")
-    decoder = UltrasonicDecoder(
+    decoder = _get_decoder(
         freq_0=encoder.freq_0,
         freq_1=encoder.freq_1,
         sample_rate=encoder.sample_rate
     )
     
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda filename: _decode_batch_file(decoder, filename), test_files))
+    
     success_count = 0
-    for i, filename in enumerate(test_files):
-        # Load audio file
-        audio_segment = AudioSegment.from_wav(filename)
-        audio_array = np.array(audio_segment.get_array_of_samples()).astype(np.float32) / 32767.0
-        
-        # Decode
-        decoded_bytes = decoder.decode_payload(audio_array)
-        
+    for i, (filename, decoded_bytes) in enumerate(zip(test_files, results)):
         if decoded_bytes:
             decoded_command = decoded_bytes.decode('utf-8', errors='ignore')
             expected_command = commands[i]
@@ -310,75 +396,88 @@ def batch_processing_example():
     cleanup_files(test_files)
 
 
+def _save_batch_file(filename: str, background: np.ndarray, encoded_signal: np.ndarray,
+                     sample_rate: int, mixed_out: np.ndarray, pcm_out: np.ndarray) -> str:
+    """Mix one batch file's command into its background and save it as WAV."""
+    mixed_audio = mix_audio_signals(background, encoded_signal, sample_rate, out=mixed_out)
+    mixed_int16 = float_to_pcm16(mixed_audio, out=pcm_out[:len(mixed_audio)])
+    wavfile.write(filename, sample_rate, mixed_int16)
+    return filename
+
+
+def _decode_batch_file(decoder: UltrasonicDecoder, filename: str):
+    """Load one batch file and decode its payload (None if decoding fails)."""
+    _, pcm = wavfile.read(filename)
+    return decoder.decode_payload(_pcm16_to_float(pcm))
+
+
+def _convert_and_decode(decoder: UltrasonicDecoder, audio_segment: AudioSegment, filename: str, fmt: str):
+    """Export audio in the given format, reload it and decode the payload."""
+    if fmt == 'mp3':
+        audio_segment.export(filename, format="mp3", bitrate="192k")
+    else:
+        audio_segment.export(filename, format=fmt)
+    
+    # Load and test decoding
+    loaded_array = _segment_to_float(AudioSegment.from_file(filename))
+    return decoder.decode_payload(loaded_array)
+
+
 def format_conversion_test():
     """Test encoding/decoding across different audio formats."""
     print("\n=== Audio Format Conversion Test ===")
     
-    encoder = UltrasonicEncoder(amplitude=0.25)
-    decoder = UltrasonicDecoder(freq_0=encoder.freq_0, freq_1=encoder.freq_1, sample_rate=encoder.sample_rate)
+    encoder = _get_encoder(amplitude=0.25)
+    decoder = _get_decoder(freq_0=encoder.freq_0, freq_1=encoder.freq_1, sample_rate=encoder.sample_rate)
     
     command = "format:test_command"
     
     # Create base audio
     duration = 4.0
     sample_rate = 44100
-    t = np.linspace(0, duration, int(sample_rate * duration), False)
-    base_audio = 0.2 * np.sin(2 * np.pi * 1000 * t)  # 1kHz tone
+    t = _time_axis(sample_rate, duration)
+    base_audio = _synthesize_tones(t, [1000], [0.2])  # 1kHz tone
     
     # Embed command
     encoded_signal = encoder.encode_payload(command.encode())
     mixed_audio = mix_audio_signals(base_audio, encoded_signal, sample_rate)
     
+    mixed_int16 = float_to_pcm16(mixed_audio)
+    
     # Test different formats
     formats = ['wav', 'mp3', 'ogg']  # Remove 'flac' if not supported
-    test_files = []
-    
-    for fmt in formats:
-        try:
-            # Create AudioSegment
-            mixed_int16 = (mixed_audio * 32767).astype(np.int16)
-            audio_segment = AudioSegment(
-                mixed_int16.tobytes(),
-                frame_rate=sample_rate,
-                sample_width=2,
-                channels=1
-            )
-            
-            # Export in different format
-            filename = f"format_test.{fmt}"
-            
-            if fmt == 'mp3':
-                audio_segment.export(filename, format="mp3", bitrate="192k")
-            elif fmt == 'ogg':
-                audio_segment.export(filename, format="ogg")
-            else:  # wav
-                audio_segment.export(filename, format="wav")
-            
-            test_files.append(filename)
-            print(f"  Created {filename}")
-            
-            # Load and test decoding
-            loaded_segment = AudioSegment.from_file(filename)
-            loaded_array = np.array(loaded_segment.get_array_of_samples()).astype(np.float32) / 32767.0
-            
-            # Handle stereo if necessary
-            if loaded_segment.channels == 2:
-                # Convert stereo to mono by averaging channels
-                loaded_array = loaded_array.reshape(-1, 2).mean(axis=1)
-            
-            decoded_bytes = decoder.decode_payload(loaded_array)
-            
-            if decoded_bytes:
-                decoded_command = decoded_bytes.decode('utf-8', errors='ignore')
-                if decoded_command == command:
-                    print(f"    ✓ {fmt.upper()} format: Decode successful")
-                else:
-                    print(f"    ✗ {fmt.upper()} format: Decode mismatch")
-            else:
-                print(f"    ✗ {fmt.upper()} format: Decode failed")
+    test_files = [f"format_test.{fmt}" for fmt in formats]
+    
+    audio_segment = AudioSegment(
+        mixed_int16.tobytes(),
+        frame_rate=sample_rate,
+        sample_width=2,
+        channels=1
+    )
+    
+    # Each export/reload round-trip runs in its own ffmpeg subprocess
+    with ThreadPoolExecutor(max_workers=len(formats)) as executor:
+        futures = [
+            executor.submit(_convert_and_decode, decoder, audio_segment, filename, fmt)
+            for filename, fmt in zip(test_files, formats)
+        ]
+        
+        for filename, fmt, future in zip(test_files, formats, futures):
+            try:
+                decoded_bytes = future.result()
+                print(f"  Created {filename}")
                 
-        except Exception as e:
-            print(f"    ✗ {fmt.upper()} format: Error - {e}")
+                if decoded_bytes:
+                    decoded_command = decoded_bytes.decode('utf-8', errors='ignore')
+                    if decoded_command == command:
+                        print(f"    ✓ {fmt.upper()} format: Decode successful")
+                    else:
+                        print(f"    ✗ {fmt.upper()} format: Decode mismatch")
+                else:
+                    print(f"    ✗ {fmt.upper()} format: Decode failed")
+                    
+            except Exception as e:
+                print(f"    ✗ {fmt.upper()} format: Error - {e}")
     
     # Clean up
     cleanup_files(test_files)
@@ -387,11 +486,9 @@ def format_conversion_test():
 def cleanup_files(file_list):
     """Clean up temporary files."""
     for file_path in file_list:
-        try:
-            if os.path.exists(file_path):
-                os.remove(file_path)
-        except OSError:
-            pass
+        # A missing file raises FileNotFoundError, an OSError, so no exists() check is needed
+        with suppress(OSError):
+            os.unlink(file_path)
 
 
 if __name__ == "__main__":
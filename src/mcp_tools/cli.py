@@ -5,31 +5,24 @@ This module provides a CLI for starting the MCP server and managing
 steganography operations from the command line.
 """
 
-import argparse
 import asyncio
+import glob
 import logging
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import Callable, List, Optional, Tuple
 
 try:
     import typer
     from rich.console import Console
     from rich.table import Table
     from rich.panel import Panel
-    from rich.progress import track
-    import click
 except ImportError:
-    print("Missing CLI dependencies. Install with: pip install typer rich click")
+    print("Missing CLI dependencies. Install with: pip install typer rich")
     sys.exit(1)
 
-from .server import run_server
-from .tools.embed_tools import embed_audio_command, embed_video_command
-from .tools.decode_tools import decode_audio_command, decode_video_command, analyze_media_file
-from .tools.config_tools import configure_frequencies, configure_encryption_key, get_current_config
-from .schemas.embed import EmbedAudioRequest, EmbedVideoRequest
-from .schemas.decode import DecodeRequest
-from .schemas.config import ConfigFrequenciesRequest, ConfigKeyRequest
+# The MCP server, tools and schemas are imported inside the commands that
+# use them, so --help, --version and info start without loading them
 
 
 # Initialize Typer app and Rich console
@@ -41,15 +34,117 @@ app = typer.Typer(
 )
 console = Console()
 
+# Supported media file extensions
+_AUDIO_EXTS = frozenset({'.mp3', '.wav', '.flac', '.ogg', '.m4a'})
+_VIDEO_EXTS = frozenset({'.mp4', '.avi', '.mov', '.mkv'})
 
-def version_callback(value: bool):
-    if value:
-        console.print("🎵 Agentic Commands Steganography v1.0.0")
-        raise typer.Exit()
+# Result panel bodies, filled in from the result models' fields
+_SERVER_START_TEMPLATE = (
+    "🚀 Starting Agentic Commands Steganography MCP Server\n"
+    "Transport: stdio\n"
+    "Log Level: {log_level}\n\n"
+    "This server uses stdio transport for MCP communication.\n"
+    "Connect your MCP client to this server's stdin/stdout."
+)
+_EMBED_OK_TEMPLATE = (
+    "✅ Command embedded successfully!\n"
+    "Output file: {output_file}\n"
+    "File size: {file_size_bytes:,} bytes\n"
+    "Processing time: {processing_time_ms:.1f} ms\n"
+    "Frequency: {ultrasonic_freq} Hz\n"
+    "Amplitude: {amplitude}"
+)
+_DECODE_OK_TEMPLATE = (
+    "✅ Command decoded successfully!\n"
+    "Command: {command}\n"
+    "Processing time: {processing_time_ms:.1f} ms"
+)
+_CONFIDENCE_TEMPLATE = "\nConfidence: {confidence_score:.2f}"
+_DECODE_FAIL_TEMPLATE = (
+    "❌ No command found\n"
+    "Message: {message}\n"
+    "Processing time: {processing_time_ms:.1f} ms"
+)
+
+
+def _classify(file_path: Path) -> Optional[str]:
+    """Get the media kind of a file from its extension ('audio', 'video' or None)."""
+    suffix = file_path.suffix.lower()
+    return 'audio' if suffix in _AUDIO_EXTS else 'video' if suffix in _VIDEO_EXTS else None
+
+
+def _key_value_table(title: str, key_header: str, rows: List[Tuple[str, str]]) -> Table:
+    """Build a two-column key/value table with a fixed-width key column."""
+    table = Table(title=title)
+    table.add_column(key_header, style="cyan", width=25, no_wrap=True)
+    table.add_column("Value", style="magenta", overflow="fold")
+    
+    for key, value in rows:
+        table.add_row(key, value)
+    
+    return table
+
+
+def _exit_if_missing(file_path: Path) -> None:
+    """
+    Exit with a "file not found" error if a failed operation's input is missing.
+    
+    Commands hand paths straight to the tools, which open (and validate) the
+    file themselves; the path is only checked again to explain a failure.
+    """
+    if not file_path.exists():
+        console.print(f"[red]Error: File not found: {file_path}[/red]")
+        sys.exit(1)
+
+
+def _embed_file(file_path: Path, command: str, output: Optional[str], freq: float,
+                amplitude: float, obfuscate: bool, bitrate: str):
+    """Embed a command with the audio or video tool matching the file's extension."""
+    from .tools.embed_tools import embed_audio_command, embed_video_command
+    from .schemas.embed import EmbedAudioRequest, EmbedVideoRequest
+    
+    kind = _classify(file_path)
+    
+    if kind == 'audio':
+        return embed_audio_command(EmbedAudioRequest(
+            audio_file_path=str(file_path),
+            command=command,
+            output_path=output,
+            ultrasonic_freq=freq,
+            amplitude=amplitude,
+            obfuscate=obfuscate,
+            bitrate=bitrate
+        ))
+    if kind == 'video':
+        return embed_video_command(EmbedVideoRequest(
+            video_file_path=str(file_path),
+            command=command,
+            output_path=output,
+            ultrasonic_freq=freq,
+            amplitude=amplitude,
+            obfuscate=obfuscate,
+            audio_bitrate=bitrate
+        ))
+    raise ValueError(f"Unsupported file format: {file_path.suffix}")
+
+
+def _decode_file(file_path: Path, analysis: bool):
+    """Decode a command with the audio or video tool matching the file's extension."""
+    from .tools.decode_tools import decode_audio_command, decode_video_command
+    from .schemas.decode import DecodeRequest
+    
+    decode_tools = {'audio': decode_audio_command, 'video': decode_video_command}
+    decode_tool = decode_tools.get(_classify(file_path))
+    if decode_tool is None:
+        raise ValueError(f"Unsupported file format: {file_path.suffix}")
+    
+    return decode_tool(DecodeRequest(file_path=str(file_path), detailed_analysis=analysis))
 
-@app.callback()
+
+@app.callback(invoke_without_command=True)
 def main(
-    version: bool = typer.Option(False, "--version", "-v", callback=version_callback, help="Show version and exit")
+    ctx: typer.Context,
+    version: bool = typer.Option(False, "--version", "-v", is_flag=True, help="Show version and exit")
 ):
     """
     🎵 Agentic Commands Steganography
@@ -62,11 +157,18 @@ def main(
     • server    - Start the MCP server
     • embed     - Embed a command into a media file
     • decode    - Decode a command from a media file
+    • embed-batch  - Embed a command into many media files
+    • decode-batch - Decode commands from many media files
     • analyze   - Analyze a media file for steganographic content
     • config    - Configure system settings
     • info      - Show system information
     """
-    pass
+    if version:
+        console.print("🎵 Agentic Commands Steganography v1.0.0")
+        raise typer.Exit()
+    
+    if ctx.invoked_subcommand is None:
+        ctx.fail("Missing command.")
 
 
 @app.command("server")
@@ -75,11 +177,7 @@ def start_server(
 ):
     """Start the MCP server (uses stdio transport)."""
     console.print(Panel.fit(
-        f"🚀 Starting Agentic Commands Steganography MCP Server\n"
-        f"Transport: stdio\n"
-        f"Log Level: {log_level}\n\n"
-        f"This server uses stdio transport for MCP communication.\n"
-        f"Connect your MCP client to this server's stdin/stdout.",
+        _SERVER_START_TEMPLATE.format(log_level=log_level),
         title="MCP Server Startup",
         border_style="green"
     ))
@@ -88,6 +186,7 @@ def start_server(
     logging.basicConfig(level=getattr(logging, log_level.upper()))
     
     try:
+        from .server import run_server
         run_server()
     except KeyboardInterrupt:
         console.print("\n[yellow]MCP server stopped by user[/yellow]")
@@ -109,52 +208,19 @@ def embed_command(
     """Embed a command into a media file."""
     file_path = Path(file_path)
     
-    if not file_path.exists():
-        console.print(f"[red]Error: File not found: {file_path}[/red]")
-        sys.exit(1)
-    
     console.print(f"[blue]Embedding command into {file_path.name}...[/blue]")
     
     try:
-        # Determine file type
-        if file_path.suffix.lower() in ['.mp3', '.wav', '.flac', '.ogg', '.m4a']:
-            request = EmbedAudioRequest(
-                audio_file_path=str(file_path),
-                command=command,
-                output_path=output,
-                ultrasonic_freq=freq,
-                amplitude=amplitude,
-                obfuscate=obfuscate,
-                bitrate=bitrate
-            )
-            result = embed_audio_command(request)
-        elif file_path.suffix.lower() in ['.mp4', '.avi', '.mov', '.mkv']:
-            request = EmbedVideoRequest(
-                video_file_path=str(file_path),
-                command=command,
-                output_path=output,
-                ultrasonic_freq=freq,
-                amplitude=amplitude,
-                obfuscate=obfuscate,
-                audio_bitrate=bitrate
-            )
-            result = embed_video_command(request)
-        else:
-            console.print(f"[red]Error: Unsupported file format: {file_path.suffix}[/red]")
-            sys.exit(1)
+        result = _embed_file(file_path, command, output, freq, amplitude, obfuscate, bitrate)
         
         if result.success:
             console.print(Panel.fit(
-                f"✅ Command embedded successfully!\n"
-                f"Output file: {result.output_file}\n"
-                f"File size: {result.file_size_bytes:,} bytes\n"
-                f"Processing time: {result.processing_time_ms:.1f} ms\n"
-                f"Frequency: {result.ultrasonic_freq} Hz\n"
-                f"Amplitude: {result.amplitude}",
+                _EMBED_OK_TEMPLATE.format_map(result.model_dump()),
                 title="Embedding Complete",
                 border_style="green"
             ))
         else:
+            _exit_if_missing(file_path)
             console.print(f"[red]Embedding failed: {result.message}[/red]")
             sys.exit(1)
             
@@ -166,39 +232,26 @@ def embed_command(
 @app.command("decode")
 def decode_command(
     file_path: str = typer.Argument(..., help="Media file path to decode"),
-    analysis: bool = typer.Option(False, "--analysis", "-a", help="Perform detailed analysis"),
-    verbose: bool = typer.Option(False, "--verbose", "-v", help="Verbose output")
+    analysis: bool = typer.Option(False, "--analysis", "-a", is_flag=True, help="Perform detailed analysis"),
+    verbose: bool = typer.Option(False, "--verbose", "-v", is_flag=True, help="Verbose output")
 ):
     """Decode a command from a media file."""
     file_path = Path(file_path)
     
-    if not file_path.exists():
-        console.print(f"[red]Error: File not found: {file_path}[/red]")
-        sys.exit(1)
-    
     console.print(f"[blue]Decoding command from {file_path.name}...[/blue]")
     
     try:
-        request = DecodeRequest(
-            file_path=str(file_path),
-            detailed_analysis=analysis
-        )
+        result = _decode_file(file_path, analysis)
         
-        # Determine file type and decode
-        if file_path.suffix.lower() in ['.mp3', '.wav', '.flac', '.ogg', '.m4a']:
-            result = decode_audio_command(request)
-        elif file_path.suffix.lower() in ['.mp4', '.avi', '.mov', '.mkv']:
-            result = decode_video_command(request)
-        else:
-            console.print(f"[red]Error: Unsupported file format: {file_path.suffix}[/red]")
-            sys.exit(1)
+        fields = result.model_dump()
         
         if result.success and result.command:
+            body = _DECODE_OK_TEMPLATE.format_map(fields)
+            if result.confidence_score:
+                body += _CONFIDENCE_TEMPLATE.format_map(fields)
+            
             console.print(Panel.fit(
-                f"✅ Command decoded successfully!\n"
-                f"Command: {result.command}\n"
-                f"Processing time: {result.processing_time_ms:.1f} ms\n"
-                f"Confidence: {result.confidence_score:.2f}" if result.confidence_score else "",
+                body,
                 title="Decoding Complete",
                 border_style="green"
             ))
@@ -208,10 +261,9 @@ def decode_command(
                 console.print(result.analysis)
                 
         else:
+            _exit_if_missing(file_path)
             console.print(Panel.fit(
-                f"❌ No command found\n"
-                f"Message: {result.message}\n"
-                f"Processing time: {result.processing_time_ms:.1f} ms",
+                _DECODE_FAIL_TEMPLATE.format_map(fields),
                 title="Decoding Result",
                 border_style="red"
             ))
@@ -228,13 +280,12 @@ def analyze_command(
     """Analyze a media file for steganographic content."""
     file_path = Path(file_path)
     
-    if not file_path.exists():
-        console.print(f"[red]Error: File not found: {file_path}[/red]")
-        sys.exit(1)
-    
     console.print(f"[blue]Analyzing {file_path.name} for steganographic content...[/blue]")
     
     try:
+        from .tools.decode_tools import analyze_media_file
+        from .schemas.decode import DecodeRequest
+        
         request = DecodeRequest(
             file_path=str(file_path),
             detailed_analysis=True
@@ -245,25 +296,24 @@ def analyze_command(
         if result.success:
             has_content = result.encryption_detected
             
-            table = Table(title="Media Analysis Results")
-            table.add_column("Property", style="cyan")
-            table.add_column("Value", style="magenta")
-            
-            table.add_row("File", str(file_path))
-            table.add_row("Processing Time", f"{result.processing_time_ms:.1f} ms")
-            table.add_row("Steganographic Content", "✅ Detected" if has_content else "❌ Not Detected")
-            table.add_row("Confidence Score", f"{result.confidence_score:.2f}" if result.confidence_score else "N/A")
+            rows = [
+                ("File", str(file_path)),
+                ("Processing Time", f"{result.processing_time_ms:.1f} ms"),
+                ("Steganographic Content", "✅ Detected" if has_content else "❌ Not Detected"),
+                ("Confidence Score", f"{result.confidence_score:.2f}" if result.confidence_score else "N/A")
+            ]
             
             if result.detected_frequencies:
-                table.add_row("Detected Frequencies", str(result.detected_frequencies))
+                rows.append(("Detected Frequencies", str(result.detected_frequencies)))
             
-            console.print(table)
+            console.print(_key_value_table("Media Analysis Results", "Property", rows))
             
             if result.analysis:
                 console.print(f"\n[bold]Detailed Analysis:[/bold]")
                 console.print(result.analysis)
                 
         else:
+            _exit_if_missing(file_path)
             console.print(f"[red]Analysis failed: {result.message}[/red]")
             sys.exit(1)
             
@@ -272,36 +322,163 @@ def analyze_command(
         sys.exit(1)
 
 
+def _expand_paths(patterns: List[str]) -> List[Path]:
+    """Expand directories and glob patterns into a sorted list of media file paths."""
+    paths = []
+    
+    for pattern in patterns:
+        path = Path(pattern)
+        if path.is_dir():
+            paths.extend(sorted(p for p in path.iterdir() if _classify(p) is not None))
+        elif glob.has_magic(pattern):
+            paths.extend(Path(p) for p in sorted(glob.glob(pattern, recursive=True)))
+        else:
+            paths.append(path)
+    
+    # Drop duplicates while keeping the order
+    return list(dict.fromkeys(paths))
+
+
+async def _run_batch(paths: List[Path], worker: Callable, max_workers: int) -> list:
+    """
+    Run a blocking per-file worker over many files concurrently.
+    
+    Each call runs in a worker thread (embedding and decoding mostly wait on
+    ffmpeg subprocesses and file I/O), with at most max_workers in flight.
+    
+    Args:
+        paths: Files to process
+        worker: Blocking callable taking one file path and returning a result
+        max_workers: Maximum number of files processed at once
+        
+    Returns:
+        Results in input order; failed files yield their exception instead
+    """
+    semaphore = asyncio.Semaphore(max_workers)
+    
+    async def run_one(path: Path):
+        async with semaphore:
+            return await asyncio.to_thread(worker, path)
+    
+    return await asyncio.gather(*(run_one(path) for path in paths), return_exceptions=True)
+
+
+def _print_batch_summary(title: str, paths: List[Path], results: list, describe: Callable) -> int:
+    """
+    Print one summary table for a batch run.
+    
+    Args:
+        title: Table title
+        paths: Processed files
+        results: Per-file results (or exceptions) from _run_batch
+        describe: Callable mapping a result to (succeeded, detail)
+        
+    Returns:
+        Number of files that failed
+    """
+    table = Table(title=title)
+    table.add_column("File", style="cyan")
+    table.add_column("Status")
+    table.add_column("Details", style="magenta")
+    
+    failures = 0
+    for path, result in zip(paths, results):
+        if isinstance(result, Exception):
+            succeeded, detail = False, str(result)
+        else:
+            succeeded, detail = describe(result)
+        
+        failures += not succeeded
+        table.add_row(str(path), "✅" if succeeded else "❌", detail)
+    
+    console.print(table)
+    return failures
+
+
+@app.command("embed-batch")
+def embed_batch_command(
+    paths: List[str] = typer.Argument(..., help="Input media files, directories or glob patterns"),
+    command: str = typer.Option(..., "--command", "-c", help="Command to embed"),
+    freq: float = typer.Option(18500.0, "--frequency", "-f", help="Ultrasonic frequency (Hz)"),
+    amplitude: float = typer.Option(0.1, "--amplitude", "-a", help="Signal amplitude (0.0-1.0)"),
+    obfuscate: bool = typer.Option(True, "--obfuscate/--no-obfuscate", help="Obfuscate command"),
+    bitrate: str = typer.Option("192k", "--bitrate", "-b", help="Audio bitrate"),
+    max_workers: int = typer.Option(10, "--max-workers", "-w", min=1, help="Files processed at once")
+):
+    """Embed a command into many media files concurrently."""
+    files = _expand_paths(paths)
+    if not files:
+        console.print("[red]Error: No media files found[/red]")
+        sys.exit(1)
+    
+    def embed_one(file_path: Path):
+        return _embed_file(file_path, command, None, freq, amplitude, obfuscate, bitrate)
+    
+    def describe(result):
+        return result.success, result.output_file if result.success else result.message
+    
+    console.print(f"[blue]Embedding command into {len(files)} files...[/blue]")
+    results = asyncio.run(_run_batch(files, embed_one, max_workers))
+    
+    if _print_batch_summary("Batch Embedding Results", files, results, describe):
+        sys.exit(1)
+
+
+@app.command("decode-batch")
+def decode_batch_command(
+    paths: List[str] = typer.Argument(..., help="Media files, directories or glob patterns to decode"),
+    analysis: bool = typer.Option(False, "--analysis", "-a", is_flag=True, help="Perform detailed analysis"),
+    max_workers: int = typer.Option(10, "--max-workers", "-w", min=1, help="Files processed at once")
+):
+    """Decode commands from many media files concurrently."""
+    files = _expand_paths(paths)
+    if not files:
+        console.print("[red]Error: No media files found[/red]")
+        sys.exit(1)
+    
+    def decode_one(file_path: Path):
+        return _decode_file(file_path, analysis)
+    
+    def describe(result):
+        found = result.success and bool(result.command)
+        return found, result.command if found else result.message
+    
+    console.print(f"[blue]Decoding commands from {len(files)} files...[/blue]")
+    results = asyncio.run(_run_batch(files, decode_one, max_workers))
+    
+    _print_batch_summary("Batch Decoding Results", files, results, describe)
+
+
 @app.command("config")
 def config_command(
-    frequencies: bool = typer.Option(False, "--frequencies", "-f", help="Configure frequencies"),
+    frequencies: bool = typer.Option(False, "--frequencies", "-f", is_flag=True, help="Configure frequencies"),
     freq_0: Optional[float] = typer.Option(None, "--freq-0", help="Frequency for binary '0' (Hz)"),
     freq_1: Optional[float] = typer.Option(None, "--freq-1", help="Frequency for binary '1' (Hz)"),
-    encryption: bool = typer.Option(False, "--encryption", "-e", help="Configure encryption"),
+    encryption: bool = typer.Option(False, "--encryption", "-e", is_flag=True, help="Configure encryption"),
     key_file: Optional[str] = typer.Option(None, "--key-file", help="Path to encryption key file"),
     key_base64: Optional[str] = typer.Option(None, "--key-base64", help="Base64-encoded encryption key"),
-    generate_key: bool = typer.Option(False, "--generate-key", help="Generate new encryption key"),
-    show: bool = typer.Option(False, "--show", "-s", help="Show current configuration")
+    generate_key: bool = typer.Option(False, "--generate-key", is_flag=True, help="Generate new encryption key"),
+    show: bool = typer.Option(False, "--show", "-s", is_flag=True, help="Show current configuration")
 ):
     """Configure system settings."""
+    from .tools.config_tools import configure_frequencies, configure_encryption_key, get_current_config
+    from .schemas.config import ConfigFrequenciesRequest, ConfigKeyRequest
     
     if show:
         config = get_current_config()
         
-        table = Table(title="System Configuration")
-        table.add_column("Setting", style="cyan")
-        table.add_column("Value", style="magenta")
+        rows = [
+            ("Frequency 0", f"{config['frequencies']['freq_0']} Hz"),
+            ("Frequency 1", f"{config['frequencies']['freq_1']} Hz"),
+            ("Frequency Separation", f"{config['frequencies']['separation_hz']} Hz"),
+            ("Encryption Configured", "✅ Yes" if config['encryption']['key_set'] else "❌ No"),
+            ("Encryption Algorithm", config['encryption']['algorithm']),
+            ("Signal Amplitude", str(config['signal']['amplitude'])),
+            ("Bit Duration", f"{config['signal']['bit_duration']} s"),
+            ("Sample Rate", f"{config['signal']['sample_rate']} Hz")
+        ]
         
-        table.add_row("Frequency 0", f"{config['frequencies']['freq_0']} Hz")
-        table.add_row("Frequency 1", f"{config['frequencies']['freq_1']} Hz")
-        table.add_row("Frequency Separation", f"{config['frequencies']['separation_hz']} Hz")
-        table.add_row("Encryption Configured", "✅ Yes" if config['encryption']['key_set'] else "❌ No")
-        table.add_row("Encryption Algorithm", config['encryption']['algorithm'])
-        table.add_row("Signal Amplitude", str(config['signal']['amplitude']))
-        table.add_row("Bit Duration", f"{config['signal']['bit_duration']} s")
-        table.add_row("Sample Rate", f"{config['signal']['sample_rate']} Hz")
-        
-        console.print(table)
+        console.print(_key_value_table("System Configuration", "Setting", rows))
         return
     
     if frequencies:
@@ -368,10 +545,15 @@ def info_command():
     console.print(info_panel)
 
 
-def main():
+# Click command built once from the registrations above; invoking it
+# directly skips the rebuild that app() performs on every call
+_cli_cmd = typer.main.get_command(app)
+
+
+def cli_entry() -> None:
     """Main entry point for the CLI."""
-    app()
+    _cli_cmd(standalone_mode=True)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    cli_entry()
\ No newline at end of file
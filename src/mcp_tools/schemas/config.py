@@ -1,17 +1,21 @@
 """Schemas for configuration operations."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any
 
 
 class ConfigFrequenciesRequest(BaseModel):
     """Request schema for frequency configuration."""
+    model_config = ConfigDict(frozen=True)
+    
     freq_0: float = Field(description="Frequency for bit '0' in Hz")
     freq_1: float = Field(description="Frequency for bit '1' in Hz")
 
 
 class ConfigKeyRequest(BaseModel):
     """Request schema for encryption key configuration."""
+    model_config = ConfigDict(frozen=True)
+    
     key_base64: Optional[str] = Field(None, description="Base64 encoded encryption key")
     key_file_path: Optional[str] = Field(None, description="Path to file containing encryption key")
     generate_new: bool = Field(False, description="Generate a new random key")
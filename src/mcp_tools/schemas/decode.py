@@ -1,11 +1,13 @@
 """Schemas for decoding operations."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional, Dict, Any
 
 
 class DecodeRequest(BaseModel):
     """Request schema for decoding operations."""
+    model_config = ConfigDict(frozen=True)
+    
     file_path: str = Field(description="Path to the media file to decode")
     detailed_analysis: bool = Field(False, description="Include detailed signal analysis")
 
@@ -1,28 +1,32 @@
 """Schemas for embedding operations."""
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Optional
 
 
 class EmbedAudioRequest(BaseModel):
     """Request schema for audio embedding."""
+    model_config = ConfigDict(frozen=True)
+    
     audio_file_path: str = Field(description="Path to the input audio file")
     command: str = Field(description="Command to embed in the audio") 
     output_path: Optional[str] = Field(None, description="Output file path (auto-generated if not specified)")
     obfuscate: bool = Field(True, description="Apply obfuscation to the embedded data")
     bitrate: str = Field("192k", description="Audio bitrate for output")
-    ultrasonic_freq: float = Field(18500, description="Ultrasonic carrier frequency")
+    ultrasonic_freq: float = Field(18500.0, description="Ultrasonic carrier frequency")
     amplitude: float = Field(0.1, description="Signal amplitude")
 
 
 class EmbedVideoRequest(BaseModel):
     """Request schema for video embedding."""
+    model_config = ConfigDict(frozen=True)
+    
     video_file_path: str = Field(description="Path to the input video file")
     command: str = Field(description="Command to embed in the video")
     output_path: Optional[str] = Field(None, description="Output file path (auto-generated if not specified)")
     obfuscate: bool = Field(True, description="Apply obfuscation to the embedded data")
     audio_bitrate: str = Field("192k", description="Audio bitrate for output")
-    ultrasonic_freq: float = Field(18500, description="Ultrasonic carrier frequency")
+    ultrasonic_freq: float = Field(18500.0, description="Ultrasonic carrier frequency")
     amplitude: float = Field(0.1, description="Signal amplitude")
 
 
@@ -2,6 +2,8 @@
 
 import os
 import base64
+import binascii
+from dataclasses import dataclass, replace
 from typing import Dict, Any
 from ..schemas.config import ConfigFrequenciesRequest, ConfigKeyRequest, ConfigResponse
 from agentic_commands_stego.crypto.cipher import CipherService
@@ -9,22 +11,33 @@ from .embed_tools import set_cipher_key as set_embed_cipher_key
 from .decode_tools import set_cipher_key as set_decode_cipher_key
 
 
-# Global configuration state
-_current_config: Dict[str, Any] = {
-    "frequencies": {
-        "freq_0": 18500,
-        "freq_1": 19500
-    },
-    "encryption": {
-        "key_set": False,
-        "algorithm": "AES-256-GCM"
-    },
-    "signal": {
-        "amplitude": 0.1,
-        "bit_duration": 0.01,
-        "sample_rate": 48000
-    }
-}
+# Upper bound on key file reads; a valid key is 32 raw bytes or 44
+# base64 characters, so anything past this is never needed
+_MAX_KEY_FILE_BYTES = 256
+
+
+@dataclass(frozen=True)
+class SystemConfig:
+    """Immutable snapshot of the system configuration."""
+    freq_0: float = 18500
+    freq_1: float = 19500
+    key_set: bool = False
+    algorithm: str = "AES-256-GCM"
+    amplitude: float = 0.1
+    bit_duration: float = 0.01
+    sample_rate: int = 48000
+    
+    def frequencies(self) -> Dict[str, Any]:
+        """Frequency settings as a new dict."""
+        return {"freq_0": self.freq_0, "freq_1": self.freq_1}
+    
+    def encryption(self) -> Dict[str, Any]:
+        """Encryption settings as a new dict."""
+        return {"key_set": self.key_set, "algorithm": self.algorithm}
+
+
+# Global configuration state, replaced (never mutated) on every change
+_config = SystemConfig()
 
 
 def configure_frequencies(request: ConfigFrequenciesRequest) -> ConfigResponse:
@@ -44,7 +57,7 @@ def configure_frequencies(request: ConfigFrequenciesRequest) -> ConfigResponse:
     Raises:
         ValueError: If frequencies are invalid or too close together
     """
-    global _current_config
+    global _config
     
     try:
         # Validate frequency values
@@ -61,11 +74,10 @@ def configure_frequencies(request: ConfigFrequenciesRequest) -> ConfigResponse:
             raise ValueError("Frequencies should be below 22kHz for compatibility")
         
         # Store previous config
-        previous_config = _current_config["frequencies"].copy()
+        previous_config = _config.frequencies()
         
         # Update configuration
-        _current_config["frequencies"]["freq_0"] = request.freq_0
-        _current_config["frequencies"]["freq_1"] = request.freq_1
+        _config = replace(_config, freq_0=request.freq_0, freq_1=request.freq_1)
         
         # TODO: Update embedders and decoders with new frequencies
         # This would require accessing the global embedders/decoders
@@ -88,7 +100,7 @@ def configure_frequencies(request: ConfigFrequenciesRequest) -> ConfigResponse:
             success=False,
             message=f"Frequency configuration failed: {str(e)}",
             applied_config={},
-            previous_config=_current_config["frequencies"].copy()
+            previous_config=_config.frequencies()
         )
 
 
@@ -110,10 +122,10 @@ def configure_encryption_key(request: ConfigKeyRequest) -> ConfigResponse:
         ValueError: If key format is invalid
         FileNotFoundError: If key file doesn't exist
     """
-    global _current_config
+    global _config
     
     try:
-        previous_config = _current_config["encryption"].copy()
+        previous_config = _config.encryption()
         new_key = None
         key_source = ""
         
@@ -125,7 +137,7 @@ def configure_encryption_key(request: ConfigKeyRequest) -> ConfigResponse:
         elif request.key_base64:
             # Use provided base64 key
             try:
-                new_key = base64.b64decode(request.key_base64)
+                new_key = base64.b64decode(request.key_base64.strip().encode('ascii'), validate=True)
                 if len(new_key) != 32:
                     raise ValueError("Key must be exactly 32 bytes (256 bits)")
                 key_source = "base64_input"
@@ -138,15 +150,16 @@ def configure_encryption_key(request: ConfigKeyRequest) -> ConfigResponse:
                 raise FileNotFoundError(f"Key file not found: {request.key_file_path}")
             
             with open(request.key_file_path, 'rb') as f:
-                new_key = f.read()
+                new_key = f.read(_MAX_KEY_FILE_BYTES)
             
             if len(new_key) != 32:
                 # Try base64 decoding if raw bytes aren't 32
                 try:
-                    new_key = base64.b64decode(new_key)
-                    if len(new_key) != 32:
-                        raise ValueError("Key file must contain exactly 32 bytes")
-                except:
+                    new_key = base64.b64decode(new_key.strip(), validate=True)
+                except binascii.Error:
+                    new_key = b""
+                
+                if len(new_key) != 32:
                     raise ValueError("Key file must contain exactly 32 bytes or base64-encoded 32 bytes")
             
             key_source = f"file: {request.key_file_path}"
@@ -159,7 +172,7 @@ def configure_encryption_key(request: ConfigKeyRequest) -> ConfigResponse:
         set_decode_cipher_key(new_key)
         
         # Update configuration
-        _current_config["encryption"]["key_set"] = True
+        _config = replace(_config, key_set=True)
         
         applied_config = {
             "key_source": key_source,
@@ -179,7 +192,7 @@ def configure_encryption_key(request: ConfigKeyRequest) -> ConfigResponse:
             success=False,
             message=f"Key configuration failed: {str(e)}",
             applied_config={},
-            previous_config=_current_config["encryption"].copy()
+            previous_config=_config.encryption()
         )
 
 
@@ -191,23 +204,28 @@ def get_current_config() -> Dict[str, Any]:
     status, and signal parameters. Sensitive information like encryption keys
     are not included in the response.
     
+    Each call returns a new dict built from the immutable configuration
+    snapshot, so callers may modify it freely.
+    
     Returns:
         Dict with current configuration (excluding sensitive data)
     """
-    global _current_config
-    
-    # Return a copy without sensitive information
-    config_copy = _current_config.copy()
-    
-    # Add some computed values
-    freq_sep = abs(config_copy["frequencies"]["freq_1"] - config_copy["frequencies"]["freq_0"])
-    config_copy["frequencies"]["separation_hz"] = freq_sep
-    
-    # Add status indicators
-    config_copy["status"] = {
-        "encryption_configured": config_copy["encryption"]["key_set"],
-        "frequencies_configured": True,
-        "ready_for_operations": config_copy["encryption"]["key_set"]
-    }
-    
-    return config_copy
\ No newline at end of file
+    # Build fresh dicts from the snapshot (no sensitive information)
+    config = _config
+    return {
+        "frequencies": {
+            **config.frequencies(),
+            "separation_hz": abs(config.freq_1 - config.freq_0)
+        },
+        "encryption": config.encryption(),
+        "signal": {
+            "amplitude": config.amplitude,
+            "bit_duration": config.bit_duration,
+            "sample_rate": config.sample_rate
+        },
+        "status": {
+            "encryption_configured": config.key_set,
+            "frequencies_configured": True,
+            "ready_for_operations": config.key_set
+        }
+    }
\ No newline at end of file
@@ -2,6 +2,7 @@
 
 import os
 import time
+from functools import lru_cache
 from typing import Optional
 from ..schemas.embed import EmbedAudioRequest, EmbedVideoRequest, EmbedResponse
 from agentic_commands_stego.embed.audio_embedder import AudioEmbedder
@@ -9,35 +10,43 @@ from agentic_commands_stego.embed.video_embedder import VideoEmbedder
 from agentic_commands_stego.crypto.cipher import CipherService
 
 
-# Global embedders (will be configured via MCP server)
-_audio_embedder: Optional[AudioEmbedder] = None
-_video_embedder: Optional[VideoEmbedder] = None
+# Global encryption key (will be configured via MCP server)
 _cipher_key: Optional[bytes] = None
 
 
-def _ensure_embedders():
-    """Ensure embedders are initialized."""
-    global _audio_embedder, _video_embedder, _cipher_key
+def _ensure_cipher_key() -> bytes:
+    """Ensure the encryption key is initialized."""
+    global _cipher_key
     
     if _cipher_key is None:
         _cipher_key = CipherService.generate_key(32)
     
-    if _audio_embedder is None:
-        _audio_embedder = AudioEmbedder(key=_cipher_key)
-    
-    if _video_embedder is None:
-        _video_embedder = VideoEmbedder(key=_cipher_key)
+    return _cipher_key
+
+
+# Embedders are cached per parameter set and never reconfigured after
+# construction, so concurrent requests can share them without locking
+@lru_cache(maxsize=16)
+def _get_audio_embedder(key: bytes, ultrasonic_freq: float, amplitude: float) -> AudioEmbedder:
+    """Get the audio embedder for a key, carrier frequency and amplitude."""
+    return AudioEmbedder(key=key, ultrasonic_freq=ultrasonic_freq, amplitude=amplitude)
+
+
+@lru_cache(maxsize=16)
+def _get_video_embedder(key: bytes, ultrasonic_freq: float, amplitude: float) -> VideoEmbedder:
+    """Get the video embedder for a key, carrier frequency and amplitude."""
+    return VideoEmbedder(key=key, ultrasonic_freq=ultrasonic_freq, amplitude=amplitude)
 
 
 def set_cipher_key(key: bytes):
     """Set the encryption key for embedders."""
-    global _audio_embedder, _video_embedder, _cipher_key
+    global _cipher_key
     
     _cipher_key = key
     
-    # Recreate embedders with new key
-    _audio_embedder = AudioEmbedder(key=_cipher_key)
-    _video_embedder = VideoEmbedder(key=_cipher_key)
+    # Drop embedders holding the previous key
+    _get_audio_embedder.cache_clear()
+    _get_video_embedder.cache_clear()
 
 
 def embed_audio_command(request: EmbedAudioRequest) -> EmbedResponse:
@@ -59,7 +68,7 @@ def embed_audio_command(request: EmbedAudioRequest) -> EmbedResponse:
         ValueError: If the audio format is not supported
         RuntimeError: If the embedding operation fails
     """
-    _ensure_embedders()
+    cipher_key = _ensure_cipher_key()
     
     start_time = time.time()
     
@@ -68,38 +77,35 @@ def embed_audio_command(request: EmbedAudioRequest) -> EmbedResponse:
         if not os.path.exists(request.audio_file_path):
             raise FileNotFoundError(f"Audio file not found: {request.audio_file_path}")
         
-        # Generate output path if not specified
-        if request.output_path is None:
+        # Generate output path if not specified (requests are immutable)
+        output_path = request.output_path
+        if output_path is None:
             base_name = os.path.splitext(request.audio_file_path)[0]
-            request.output_path = f"{base_name}_embedded.mp3"
+            output_path = f"{base_name}_embedded.mp3"
         
-        # Configure embedder
-        _audio_embedder.set_frequencies(
-            request.ultrasonic_freq, 
-            request.ultrasonic_freq + 1000
-        )
-        _audio_embedder.set_amplitude(request.amplitude)
+        # Get an embedder configured for this request
+        embedder = _get_audio_embedder(cipher_key, request.ultrasonic_freq, request.amplitude)
         
         # Perform embedding
-        _audio_embedder.embed_file(
+        embedder.embed_file(
             request.audio_file_path,
-            request.output_path,
+            output_path,
             request.command,
             request.obfuscate,
             request.bitrate
         )
         
         # Get file size
-        file_size = os.path.getsize(request.output_path)
+        file_size = os.path.getsize(output_path)
         processing_time = (time.time() - start_time) * 1000
         
         return EmbedResponse(
             success=True,
-            output_file=request.output_path,
+            output_file=output_path,
             embedded_command=request.command,
             file_size_bytes=file_size,
             processing_time_ms=processing_time,
-            message=f"Successfully embedded command in audio file: {request.output_path}",
+            message=f"Successfully embedded command in audio file: {output_path}",
             encryption_used=True,
             ultrasonic_freq=request.ultrasonic_freq,
             amplitude=request.amplitude
@@ -139,7 +145,7 @@ def embed_video_command(request: EmbedVideoRequest) -> EmbedResponse:
         ValueError: If the video format is not supported
         RuntimeError: If the embedding operation fails
     """
-    _ensure_embedders()
+    cipher_key = _ensure_cipher_key()
     
     start_time = time.time()
     
@@ -148,38 +154,35 @@ def embed_video_command(request: EmbedVideoRequest) -> EmbedResponse:
         if not os.path.exists(request.video_file_path):
             raise FileNotFoundError(f"Video file not found: {request.video_file_path}")
         
-        # Generate output path if not specified
-        if request.output_path is None:
+        # Generate output path if not specified (requests are immutable)
+        output_path = request.output_path
+        if output_path is None:
             base_name = os.path.splitext(request.video_file_path)[0]
-            request.output_path = f"{base_name}_embedded.mp4"
+            output_path = f"{base_name}_embedded.mp4"
         
-        # Configure embedder
-        _video_embedder.set_frequencies(
-            request.ultrasonic_freq, 
-            request.ultrasonic_freq + 1000
-        )
-        _video_embedder.set_amplitude(request.amplitude)
+        # Get an embedder configured for this request
+        embedder = _get_video_embedder(cipher_key, request.ultrasonic_freq, request.amplitude)
         
         # Perform embedding
-        _video_embedder.embed_file(
+        embedder.embed_file(
             request.video_file_path,
-            request.output_path,
+            output_path,
             request.command,
             request.obfuscate,
             request.audio_bitrate
         )
         
         # Get file size
-        file_size = os.path.getsize(request.output_path)
+        file_size = os.path.getsize(output_path)
         processing_time = (time.time() - start_time) * 1000
         
         return EmbedResponse(
             success=True,
-            output_file=request.output_path,
+            output_file=output_path,
             embedded_command=request.command,
             file_size_bytes=file_size,
             processing_time_ms=processing_time,
-            message=f"Successfully embedded command in video file: {request.output_path}",
+            message=f"Successfully embedded command in video file: {output_path}",
             encryption_used=True,
             ultrasonic_freq=request.ultrasonic_freq,
             amplitude=request.amplitude
@@ -306,9 +306,9 @@ async def get_api_info():
     }
 
 
-@app.get("/health")
+@app.api_route("/health", methods=["GET", "HEAD"])
 async def health_check():
-    """Health check endpoint."""
+    """Health check endpoint (HEAD serves as a body-less readiness probe)."""
     return {"status": "healthy", "message": "Steganography service is running"}
 
 
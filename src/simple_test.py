@@ -24,7 +24,7 @@ def simple_test():
     preamble_pattern = encoder._generate_preamble()
     preamble_signal = encoder._generate_fsk_signal(preamble_pattern)
     
-    print(f"Preamble pattern: '{preamble_pattern}' ({len(preamble_pattern)} bits)")
+    print(f"Preamble pattern: '{''.join(map(str, preamble_pattern))}' ({len(preamble_pattern)} bits)")
     print(f"Signal length: {len(preamble_signal)} samples")
     
     # Apply filtering
@@ -0,0 +1,95 @@
+"""
+Tests for the example API client.
+Tests upload retries against a local HTTP server.
+"""
+
+import pytest
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from ..examples import api_client
+from ..examples.api_client import UltrasonicAgenticsClient
+
+
+class _FlakyUploadHandler(BaseHTTPRequestHandler):
+    """Answers the first POST with 503 and records every body it receives."""
+    
+    def do_POST(self):
+        length = int(self.headers['Content-Length'])
+        body = b''
+        
+        # A truncated body would otherwise block until the client gives up
+        self.connection.settimeout(2)
+        try:
+            while len(body) < length:
+                chunk = self.rfile.read1(length - len(body))
+                if not chunk:
+                    break
+                body += chunk
+        except socket.timeout:
+            pass
+        
+        self.server.received.append((length, body))
+        
+        payload = b'{}'
+        self.send_response(503 if len(self.server.received) == 1 else 200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+    
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def flaky_server():
+    """Provide a local server whose first upload fails with 503."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _FlakyUploadHandler)
+    server.received = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def client(flaky_server, monkeypatch):
+    """Provide a client pointed at the flaky server, without retry delays."""
+    monkeypatch.setattr(api_client, '_UPLOAD_BACKOFF', 0)
+    client = UltrasonicAgenticsClient(f"http://127.0.0.1:{flaky_server.server_address[1]}")
+    client.session.trust_env = False
+    return client
+
+
+class TestUploadRetries:
+    """Test suite for retried multipart uploads."""
+    
+    def test_retried_upload_from_path_resends_full_body(self, client, flaky_server, tmp_path):
+        """Test that a 503 on the first upload is retried with the complete file."""
+        audio = bytes(range(256)) * 20
+        path = tmp_path / "upload.wav"
+        path.write_bytes(audio)
+        
+        response = client._post_file("/decode/audio", str(path))
+        
+        assert response.status_code == 200
+        assert len(flaky_server.received) == 2
+        (first_length, _), (length, body) = flaky_server.received
+        assert length == first_length
+        assert len(body) == length
+        assert audio in body
+    
+    def test_retried_upload_from_file_object_resends_full_body(self, client, flaky_server):
+        """Test that an in-memory upload is rewound before it is retried."""
+        audio = bytes(range(256)) * 20
+        
+        response = client._post_file("/decode/audio", ("mem.wav", BytesIO(audio), "audio/wav"))
+        
+        assert response.status_code == 200
+        assert len(flaky_server.received) == 2
+        length, body = flaky_server.received[1]
+        assert len(body) == length
+        assert audio in body
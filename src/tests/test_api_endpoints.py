@@ -65,6 +65,12 @@ class TestAPIEndpoints:
         assert data["status"] == "healthy"
         assert "message" in data
     
+    def test_health_check_head(self, client):
+        """Test HEAD /health readiness probe."""
+        response = client.head("/health")
+        assert response.status_code == 200
+        assert response.content == b""
+    
     @patch('agentic_commands_stego.embed.audio_embedder.AudioEmbedder.embed_file')
     def test_embed_audio_success(self, mock_embed, client, sample_audio_file):
         """Test successful audio embedding."""
@@ -183,6 +183,7 @@ class TestEnhancedErrorCorrection:
         
         # Apply interleaving
         interleaved = self.encoder._apply_interleaving(test_bits)
+        interleaved = ''.join(map(str, interleaved))
         
         # Remove interleaving
         deinterleaved = self.decoder._remove_interleaving(interleaved)
@@ -259,6 +259,20 @@ class TestUltrasonicDecoder:
         assert strength_weak > strength_silent
         assert 0.0 <= strength_strong <= 1.0
     
+    def test_analyze_signal_matches_individual_measurements(self):
+        """Test that one-pass analysis agrees with the separate methods."""
+        encoder = UltrasonicEncoder()
+        decoder = UltrasonicDecoder()
+        
+        signal = encoder.encode_payload(b"analyze")
+        signal = np.concatenate([signal, np.zeros(4800)])
+        
+        analysis = decoder.analyze_signal(signal)
+        
+        assert analysis['has_signal'] == decoder.detect_signal_presence(signal)
+        assert analysis['signal_strength'] == pytest.approx(decoder.get_signal_strength(signal))
+        assert analysis['payload'] == decoder.decode_payload(signal) == b"analyze"
+    
     def test_set_frequencies_updates_correctly(self):
         """Test that frequency setting updates decoder correctly."""
         decoder = UltrasonicDecoder()
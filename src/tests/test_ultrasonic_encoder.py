@@ -76,12 +76,13 @@ class TestUltrasonicEncoder:
         # Test single byte
         payload = b"\x42"  # 01000010 in binary
         bits = encoder._payload_to_bits(payload)
-        assert bits == "01000010"
+        assert bits.dtype == np.uint8
+        assert bits.tolist() == [0, 1, 0, 0, 0, 0, 1, 0]
         
         # Test multiple bytes
         payload = b"\x42\xFF"  # 01000010 11111111
         bits = encoder._payload_to_bits(payload)
-        assert bits == "0100001011111111"
+        assert "".join(map(str, bits)) == "0100001011111111"
     
     def test_generate_preamble_returns_consistent_pattern(self):
         """Test that preamble generation is consistent."""
@@ -90,9 +91,9 @@ class TestUltrasonicEncoder:
         preamble1 = encoder._generate_preamble()
         preamble2 = encoder._generate_preamble()
         
-        assert preamble1 == preamble2
+        assert np.array_equal(preamble1, preamble2)
         assert len(preamble1) > 0
-        assert all(bit in "01" for bit in preamble1)
+        assert all(bit in (0, 1) for bit in preamble1)
     
     def test_add_error_correction_adds_parity_bits(self):
         """Test that error correction adds repetition coding."""
@@ -154,6 +155,37 @@ class TestUltrasonicEncoder:
         assert abs(first_peak_freq - encoder.freq_0) < 100  # Within 100 Hz
         assert abs(second_peak_freq - encoder.freq_1) < 100  # Within 100 Hz
     
+    def test_modulate_fsk_is_phase_continuous(self):
+        """Test that the carrier phase carries across bit boundaries."""
+        encoder = UltrasonicEncoder(
+            freq_0=1025,  # 10.25 cycles per bit, so a phase reset would click
+            freq_1=2000,
+            sample_rate=8000,
+            bit_duration=0.01
+        )
+        
+        bits = "0101100"
+        signal = encoder._modulate_fsk(bits)
+        assert signal.dtype == np.float32
+        
+        # Reference CPFSK: integrate the instantaneous frequency sample by sample
+        samples_per_bit = int(encoder.sample_rate * encoder.bit_duration)
+        freqs = np.repeat([encoder.freq_1 if bit == "1" else encoder.freq_0 for bit in bits],
+                          samples_per_bit)
+        phase = 2 * np.pi * (np.cumsum(freqs) - freqs) / encoder.sample_rate
+        expected = encoder.amplitude * np.sin(phase)
+        
+        np.testing.assert_allclose(signal, expected, atol=1e-9)
+    
+    def test_tone_tables_shared_between_encoders(self):
+        """Test that encoders with the same parameters reuse one set of tone tables."""
+        encoder_a = UltrasonicEncoder()
+        encoder_b = UltrasonicEncoder()
+        encoder_a.warmup()
+        
+        assert encoder_b._get_bit_tones() is encoder_a._get_bit_tones()
+        assert UltrasonicEncoder(amplitude=0.2)._get_bit_tones() is not encoder_a._get_bit_tones()
+    
     def test_apply_windowing_reduces_artifacts(self):
         """Test that windowing is applied to tone segments."""
         encoder = UltrasonicEncoder()
@@ -240,6 +272,16 @@ class TestUltrasonicEncoder:
         
         assert encoder.amplitude == new_amplitude
     
+    def test_set_amplitude_applies_to_later_encodings(self):
+        """Test that cached bit tones are rebuilt after an amplitude change."""
+        encoder = UltrasonicEncoder(amplitude=0.1)
+        encoder.encode_payload(b"x")
+        
+        encoder.set_amplitude(0.5)
+        signal = encoder.encode_payload(b"x")
+        
+        assert np.max(np.abs(signal)) > 0.4
+    
     def test_set_amplitude_rejects_invalid_values(self):
         """Test that invalid amplitude values are rejected."""
         encoder = UltrasonicEncoder()